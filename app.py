@@ -1,13 +1,18 @@
 import os
 import random
+import re
+import hashlib
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from moviepy import ImageClip, AudioFileClip, CompositeVideoClip, concatenate_audioclips
-import textwrap
 import openai
 from dotenv import load_dotenv
-from token_tracker import track_usage
+from token_tracker import Usage, track_usage
 
 # Load environment variables
 load_dotenv()
@@ -20,6 +25,33 @@ IMAGE_SIZE = (1080, 1920)
 TORCH_PATH = "icons/torch.png"
 CAMERA_PATH = "icons/camera.png"
 LOGO_PATH = "icons/cronWorker.png"
+BACKGROUND_CACHE_DIR = "cache"
+
+# In batch worker processes, token usage is collected here and handed back to
+# the parent, which owns the usage totals; None in the main process
+_worker_usage = None
+
+# Loaded FreeType faces keyed by (path, size), shared across threads
+_FONTS = {}
+_FONTS_LOCK = threading.Lock()
+
+# POV headline options for the lockscreen frame
+POV_TEXTS = (
+    "POV: A notification changes your entire life trajectory",
+    "POV: Duolingo has finally a worthy opponent",
+    "POV: You were scrolling hopelessly and then your phone hits you",
+)
+
+def _track_usage(usage, operation, model):
+    """Record token usage, or queue it for the parent when running in a batch worker."""
+    if _worker_usage is None:
+        track_usage(usage, operation, model)
+    else:
+        _worker_usage.append((
+            Usage(usage.prompt_tokens, usage.completion_tokens, usage.total_tokens),
+            operation,
+            model,
+        ))
 
 def ai_function():
     """Generate a short BreatheIn-style motivational notification about scrolling."""
@@ -48,7 +80,7 @@ def ai_function():
         )
         
         # Track token usage
-        track_usage(response.usage, "Notification Generation", "gpt-3.5-turbo")
+        _track_usage(response.usage, "Notification Generation", "gpt-3.5-turbo")
         
         # Extract the message safely
         response_text = response.choices[0].message.content.strip()
@@ -66,7 +98,6 @@ def ai_function():
             response_text = response_text[1:-1]
         
         # Remove any emojis that might have slipped through
-        import re
         response_text = re.sub(r'[^\w\s\.,!?\-:;()]', '', response_text)
         
         # If response is empty or too short, use fallback
@@ -80,20 +111,35 @@ def ai_function():
         print(f"AI generation failed: {e}, using fallback")
         return fallback_text
 
-def wrap_text_words(text, words_per_line=4):
-    """Wrap text to specified number of words per line"""
-    words = text.split()
-    return [
-        " ".join(words[i : i + words_per_line])
-        for i in range(0, len(words), words_per_line)
-    ]
-
-def calculate_text_block_size(text, font):
-    """Calculate text height with word-based wrapping"""
-    wrapped_lines = wrap_text_words(text)
-    line_height = font.getbbox("A")[3] - font.getbbox("A")[1] + 25
-    return wrapped_lines, len(wrapped_lines) * line_height
-
+def measure_wrap(text, font, max_width):
+    """Greedily wrap text to max_width pixels, returning [(line, width), ...]"""
+    space_width = font.getlength(" ")
+    lines = []
+    words, line_width = [], 0
+    for word in text.split():
+        word_width = font.getlength(word)
+        if words and line_width + space_width + word_width > max_width:
+            lines.append((" ".join(words), line_width))
+            words, line_width = [word], word_width
+        else:
+            line_width += word_width + (space_width if words else 0)
+            words.append(word)
+    if words:
+        lines.append((" ".join(words), line_width))
+    return lines
+
+@lru_cache(maxsize=None)
+def line_height(font, pad=0):
+    """Height of a reference glyph plus padding, measured once per font."""
+    top, bottom = font.getbbox("A")[1::2]
+    return bottom - top + pad
+
+def calculate_text_block_size(text, font, max_width):
+    """Calculate text height with width-based wrapping"""
+    wrapped_lines = measure_wrap(text, font, max_width)
+    return wrapped_lines, len(wrapped_lines) * line_height(font, 25)
+
+@lru_cache(maxsize=None)
 def process_logo():
     """Create logo with rounded corners"""
     try:
@@ -115,7 +161,25 @@ def process_logo():
         draw.text((25, 35), "BS", fill="white", font=ImageFont.load_default())
         return logo
 
-def get_font(font_path, size):
+@lru_cache(maxsize=None)
+def whiten_icon(icon_path, size):
+    """Load an icon resized to size x size and paint it white, preserving alpha."""
+    icon = np.asarray(
+        Image.open(icon_path).convert("RGBA").resize((size, size), Image.LANCZOS)
+    )
+    white = np.full_like(icon, 255)
+    white[:, :, 3] = icon[:, :, 3]
+    return Image.fromarray(white, "RGBA")
+
+@lru_cache(maxsize=None)
+def icon_background(size):
+    """Create the translucent circle drawn behind the bottom icons."""
+    background = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(background)
+    draw.ellipse((0, 0, size, size), fill=(45, 45, 45, 180))
+    return background
+
+def _load_font(font_path, size):
     """Try to load a font, fallback to default if not available."""
     try:
         return ImageFont.truetype(font_path, size)
@@ -127,52 +191,55 @@ def get_font(font_path, size):
             # Use default font with approximate sizing
             return ImageFont.load_default()
 
-def create_fade_clip(image_path, duration, fade_duration):
-    """Create a clip with smooth opacity fade-in and fade-out effects."""
-    from moviepy import ImageSequenceClip
-    import numpy as np
-    from PIL import Image
-    
-    # Create multiple frames with different opacity levels
-    fps = 30  # Higher FPS for smoother transitions
-    total_frames = int(duration * fps)
-    fade_frames = int(fade_duration * fps)
-    
-    frames = []
-    base_image = Image.open(image_path).convert("RGBA")
-    
-    for frame_num in range(total_frames):
-        t = frame_num / fps
-        
-        # Calculate opacity with smoother curve
-        if t <= fade_duration:
-            # Fade in: 0 to 1 with smooth curve
-            progress = t / fade_duration
-            opacity = progress * progress  # Quadratic curve for smoother fade
-        elif t >= duration - fade_duration:
-            # Fade out: 1 to 0 with smooth curve
-            progress = (duration - t) / fade_duration
-            opacity = progress * progress  # Quadratic curve for smoother fade
-        else:
+def get_font(font_path, size):
+    """Return the shared font for (path, size), loading it on first use."""
+    key = (font_path, size)
+    font = _FONTS.get(key)
+    if font is None:
+        with _FONTS_LOCK:
+            font = _FONTS.get(key)
+            if font is None:
+                font = _FONTS[key] = _load_font(font_path, size)
+    return font
+
+def create_fade_clip(frame, duration, fade_duration):
+    """Create a clip with smooth opacity fade-in and fade-out effects.
+
+    The fade is applied lazily while the clip is written, so no frame
+    sequence is held in memory.
+    """
+    # The fully drawn frame, composited onto white, is the only static layer.
+    # Fonts, icons and layout are never touched per frame: a faded frame just
+    # scales each pixel's distance from white ("ink") by the opacity.
+    if frame.shape[2] == 4:
+        alpha = frame[:, :, 3:].astype(np.uint16)
+        ink = ((255 - frame[:, :, :3].astype(np.uint16)) * alpha + 127) // 255
+        opaque = (255 - ink).astype(np.uint8)
+    else:
+        opaque = np.ascontiguousarray(frame)
+        ink = 255 - opaque.astype(np.uint16)
+
+    # Scratch buffers are allocated once and reused for every faded frame
+    work = np.empty_like(ink)
+    out = np.empty_like(opaque)
+
+    def blend(opacity):
+        # Opacity scaled to 0..256 keeps the multiply in uint16 integer math
+        np.multiply(ink, int(opacity * 256), out=work)
+        work >>= 8
+        np.subtract(255, work, out=out, casting="unsafe")
+        return out
+
+    def fade(get_frame, t):
+        # Distance to the nearer clip edge, clamped to 0..1, on a quadratic curve
+        progress = max(0.0, min(t / fade_duration, (duration - t) / fade_duration, 1.0))
+        if progress >= 1.0:
             # Full opacity in middle
-            opacity = 1.0
-        
-        # Create frame with opacity
-        frame = base_image.copy()
-        if opacity < 1.0:
-            # Apply opacity to alpha channel
-            frame_array = np.array(frame)
-            frame_array[:, :, 3] = (frame_array[:, :, 3] * opacity).astype(np.uint8)
-            frame = Image.fromarray(frame_array, 'RGBA')
-        
-        # Convert to RGB for MoviePy
-        frame_rgb = Image.new('RGB', frame.size, (255, 255, 255))
-        frame_rgb.paste(frame, mask=frame.split()[-1])
-        frames.append(np.array(frame_rgb))
-    
-    # Create clip from frames
-    clip = ImageSequenceClip(frames, fps=fps)
-    print(f"Created fade clip with {len(frames)} frames at {fps} fps")
+            return opaque
+        return blend(progress * progress)
+
+    clip = ImageClip(opaque).with_duration(duration).transform(fade)
+    print(f"Created fade clip: {duration}s with {fade_duration}s fade in/out")
     return clip
 
 def draw_bold_text(draw, xy, text, font, fill, weight=0):
@@ -186,69 +253,115 @@ def draw_bold_text(draw, xy, text, font, fill, weight=0):
     try:
         draw.text(xy, text, fill=fill, font=font, stroke_width=weight, stroke_fill=fill)
     except TypeError:
+        # Rasterize the glyphs once into a mask anchored at the text origin,
+        # then stamp that mask at every stroke offset
         x, y = xy
-        for dx in range(-weight, weight + 1):
-            for dy in range(-weight, weight + 1):
-                if dx == 0 and dy == 0:
-                    continue
-                draw.text((x + dx, y + dy), text, fill=fill, font=font)
-        draw.text(xy, text, fill=fill, font=font)
+        radius = max(1, int(round(weight)))
+        right, bottom = font.getbbox(text)[2:]
+        glyph = Image.new("L", (right + 1, bottom + 1), 0)
+        ImageDraw.Draw(glyph).text((0, 0), text, fill=255, font=font)
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                draw.bitmap((x + dx, y + dy), glyph, fill=fill)
+
+def load_background(bg_path, width, height):
+    """Load a background resized and center-cropped to width x height as RGB.
+
+    Results are cached as .npy files keyed by path, mtime and size, so a
+    background that recurs across runs skips decoding and resizing.
+    """
+    cache_key = f"{os.path.abspath(bg_path)}|{os.path.getmtime(bg_path)}|{width}x{height}"
+    cache_path = os.path.join(
+        BACKGROUND_CACHE_DIR, hashlib.md5(cache_key.encode()).hexdigest() + ".npy"
+    )
+    if os.path.exists(cache_path):
+        try:
+            return np.load(cache_path, mmap_mode="r")
+        except Exception as e:
+            print(f"Ignoring unreadable background cache {cache_path}: {e}")
+
+    # Let the JPEG decoder downscale large backgrounds while decoding,
+    # so fewer pixels are decoded and resized (no-op for other formats)
+    background = Image.open(bg_path)
+    background.draft("RGB", (width, height))
+    background = background.convert("RGB")
+
+    # Background processing to fit properly
+    bg_aspect = background.width / background.height
+    target_aspect = width / height
+
+    if bg_aspect > target_aspect:
+        new_height = height
+        new_width = int(new_height * bg_aspect)
+    else:
+        new_width = width
+        new_height = int(new_width / bg_aspect)
+
+    # Resize with OpenCV (SIMD, multi-threaded) and center-crop by slicing
+    bg_array = cv2.resize(
+        np.asarray(background),
+        (new_width, new_height),
+        interpolation=cv2.INTER_LANCZOS4,
+    )
+    crop_x = (new_width - width) // 2
+    crop_y = (new_height - height) // 2
+    bg_array = np.ascontiguousarray(
+        bg_array[crop_y : crop_y + height, crop_x : crop_x + width]
+    )
+
+    # Write to a temp file first so concurrent runs never load a partial cache
+    try:
+        os.makedirs(BACKGROUND_CACHE_DIR, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, bg_array)
+        os.replace(temp_path, cache_path)
+    except Exception as e:
+        print(f"Warning: Could not cache background: {e}")
+    return bg_array
+
+def blend_onto(frame, overlay, x, y):
+    """Alpha-blend an RGBA overlay onto an RGB frame array in place at (x, y)."""
+    region = frame[y:y + overlay.height, x:x + overlay.width]
+    overlay = np.asarray(overlay)[:region.shape[0], :region.shape[1]]
+    alpha = overlay[:, :, 3:].astype(np.uint16)
+    region[...] = (
+        overlay[:, :, :3] * alpha + region * (255 - alpha) + 127
+    ) // 255
 
 def create_lockscreen_frame(bg_path, notif_msg):
     """Create a lockscreen frame using the proven layout approach."""
     try:
-        # Load background
-        background = Image.open(bg_path).convert("RGB")
-
         # POV text options - randomly select one
-        pov_texts = [
-            "POV: A notification changes your entire life trajectory",
-            "POV: Duolingo has finally a worthy opponent", 
-            "POV: You were scrolling hopelessly and then your phone hits you"
-        ]
-        selected_pov = random.choice(pov_texts)
+        selected_pov = random.choice(POV_TEXTS)
 
         # POV Section calculation
         pov_font = get_font("arial.ttf", 72)
-        pov_lines, pov_height = calculate_text_block_size(selected_pov, pov_font)
+        pov_margin_x = 80  # Horizontal margin for POV text
+        available_width = IMAGE_SIZE[0] - (2 * pov_margin_x)
+        pov_lines, pov_height = calculate_text_block_size(
+            selected_pov, pov_font, available_width
+        )
         WHITE_BOX_HEIGHT = pov_height + 240
 
-        # Background processing to fit properly
-        bg_aspect = background.width / background.height
-        target_aspect = IMAGE_SIZE[0] / (IMAGE_SIZE[1] - WHITE_BOX_HEIGHT)
-
-        if bg_aspect > target_aspect:
-            new_height = IMAGE_SIZE[1] - WHITE_BOX_HEIGHT
-            new_width = int(new_height * bg_aspect)
-        else:
-            new_width = IMAGE_SIZE[0]
-            new_height = int(new_width / bg_aspect)
-
-        background = background.resize((new_width, new_height), Image.LANCZOS)
-        background = background.crop(
-            (
-                (new_width - IMAGE_SIZE[0]) // 2,
-                (new_height - (IMAGE_SIZE[1] - WHITE_BOX_HEIGHT)) // 2,
-                (new_width + IMAGE_SIZE[0]) // 2,
-                (new_height + (IMAGE_SIZE[1] - WHITE_BOX_HEIGHT)) // 2,
-            )
+        background = load_background(
+            bg_path, IMAGE_SIZE[0], IMAGE_SIZE[1] - WHITE_BOX_HEIGHT
         )
 
-        # Create canvas
-        canvas = Image.new("RGB", IMAGE_SIZE, "white")
-        canvas.paste(background, (0, WHITE_BOX_HEIGHT))
+        # Create canvas: white POV area on top, cropped background below
+        canvas_array = np.full((IMAGE_SIZE[1], IMAGE_SIZE[0], 3), 255, dtype=np.uint8)
+        canvas_array[WHITE_BOX_HEIGHT:] = background
+        canvas = Image.fromarray(canvas_array)
         draw = ImageDraw.Draw(canvas)
 
         # Draw POV section
         draw.rectangle([0, 0, IMAGE_SIZE[0], WHITE_BOX_HEIGHT], fill="white")
         y_pos = (WHITE_BOX_HEIGHT - pov_height) // 2
         pov_weight = 1  # Set >0 to increase boldness (e.g., 1 or 2)
-        pov_margin_x = 80  # Horizontal margin for POV text
-        for line in pov_lines:
-            text_width = draw.textbbox((0, 0), line, font=pov_font)[2]
+        pov_line_height = line_height(pov_font, 25)
+        for line, text_width in pov_lines:
             # Center text within available width (full width minus margins)
-            available_width = IMAGE_SIZE[0] - (2 * pov_margin_x)
-            text_x = pov_margin_x + (available_width - text_width) // 2
+            text_x = pov_margin_x + int(available_width - text_width) // 2
             draw_bold_text(
                 draw,
                 (text_x, y_pos),
@@ -257,46 +370,53 @@ def create_lockscreen_frame(bg_path, notif_msg):
                 "black",
                 weight=pov_weight,
             )
-            y_pos += pov_font.getbbox("A")[3] - pov_font.getbbox("A")[1] + 25
+            y_pos += pov_line_height
 
         # Add "why not you?" overlay shifted up
-        canvas = canvas.convert("RGBA")
-        overlay = Image.new("RGBA", IMAGE_SIZE, (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
         overlay_font = get_font("arial.ttf", 150)
 
         text = "why not you?"
-        text_bbox = overlay_draw.textbbox((0, 0), text, font=overlay_font)
+        text_bbox = draw.textbbox((0, 0), text, font=overlay_font)
+        text_x = text_bbox[0] + (IMAGE_SIZE[0] - text_bbox[2]) // 2
         text_y = (
             IMAGE_SIZE[1] - (text_bbox[3] - text_bbox[1])
         ) // 2 - 50  # Shifted up 50px
 
+        # The text only covers a band of the frame, so draw it on an overlay
+        # just big enough for the text plus its 1px shadow offsets; drawing
+        # into a transparent layer keeps one alpha per pixel, as a full-frame
+        # overlay would
+        left, top, right, bottom = draw.textbbox((text_x, text_y), text, font=overlay_font)
+        left, top = left - 1, top - 1
+        overlay = Image.new("RGBA", (right + 1 - left, bottom + 1 - top), (0, 0, 0, 0))
+        overlay_draw = ImageDraw.Draw(overlay)
+
         # Semi-bold effect with shadow
         for offset in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
             overlay_draw.text(
-                (
-                    text_bbox[0] + (IMAGE_SIZE[0] - text_bbox[2]) // 2 + offset[0],
-                    text_y + offset[1],
-                ),
+                (text_x - left + offset[0], text_y - top + offset[1]),
                 text,
                 fill=(255, 255, 255, 100),
                 font=overlay_font,
             )
         overlay_draw.text(
-            (text_bbox[0] + (IMAGE_SIZE[0] - text_bbox[2]) // 2, text_y),
+            (text_x - left, text_y - top),
             text,
             fill=(255, 255, 255, 220),
             font=overlay_font,
         )
-        canvas = Image.alpha_composite(canvas, overlay)
+
+        # Text phase done; remaining overlays are blended into a NumPy frame
+        frame = np.array(canvas)
+        blend_onto(frame, overlay, left, top)
 
         # Notification box with proper positioning
         NOTIF_WIDTH = 1000
         notif_font = get_font("arial.ttf", 50)
-        notif_lines = textwrap.wrap(notif_msg, width=32)
-        text_height = len(notif_lines) * (
-            notif_font.getbbox("A")[3] - notif_font.getbbox("A")[1] + 30
-        )
+        # Message starts at x=160 and keeps a 40px right margin
+        notif_lines = measure_wrap(notif_msg, notif_font, NOTIF_WIDTH - 200)
+        notif_line_height = line_height(notif_font, 30)
+        text_height = len(notif_lines) * notif_line_height
         NOTIF_HEIGHT = max(220, 150 + text_height)
 
         # Create notification box
@@ -311,7 +431,7 @@ def create_lockscreen_frame(bg_path, notif_msg):
 
         # Compute vertical center of the notification text block (title + message)
         title_top = 40
-        title_height = app_name_font.getbbox("A")[3] - app_name_font.getbbox("A")[1]
+        title_height = line_height(app_name_font)
         title_bottom = title_top + title_height
         message_top = 120
         message_bottom = message_top + text_height
@@ -326,7 +446,7 @@ def create_lockscreen_frame(bg_path, notif_msg):
             logo_width = 100
             # Align logo vertically with the app name - add padding to center it properly
             app_name_y = 40
-            app_name_height = app_name_font.getbbox("A")[3] - app_name_font.getbbox("A")[1]
+            app_name_height = title_height
             # Center the logo with the app name text, accounting for proper padding
             logo_y = app_name_y + (app_name_height - logo_height) // 2
             # Add some padding to push it down a bit more
@@ -355,18 +475,16 @@ def create_lockscreen_frame(bg_path, notif_msg):
 
         # Notification message
         y_pos = 120
-        for line in notif_lines:
+        for line, _ in notif_lines:
             notif_draw.text((160, y_pos), line, fill="white", font=notif_font)
-            y_pos += notif_font.getbbox("A")[3] - notif_font.getbbox("A")[1] + 30
+            y_pos += notif_line_height
 
         # Position notification box closer to main text
-        canvas.paste(
-            notif_box,
-            (
-                (IMAGE_SIZE[0] - NOTIF_WIDTH) // 2,
-                int(text_y + (text_bbox[3] - text_bbox[1]) + 60),
-            ),
+        blend_onto(
+            frame,
             notif_box,
+            (IMAGE_SIZE[0] - NOTIF_WIDTH) // 2,
+            int(text_y + (text_bbox[3] - text_bbox[1]) + 60),
         )
 
         # Add torch and camera icons at bottom
@@ -382,32 +500,17 @@ def create_lockscreen_frame(bg_path, notif_msg):
         if os.path.exists(TORCH_PATH):
             try:
                 # Left side background
-                left_bg = Image.new("RGBA", (bg_size, bg_size), (0, 0, 0, 0))
-                draw_left = ImageDraw.Draw(left_bg)
-                draw_left.ellipse((0, 0, bg_size, bg_size), fill=(45, 45, 45, 180))
+                left_bg = icon_background(bg_size)
                 
                 # Process torch icon
-                torch = Image.open(TORCH_PATH).convert("RGBA")
-                torch = torch.resize((icon_size, icon_size), Image.LANCZOS)
-                
-                # Convert to white while preserving alpha
-                white_torch = Image.new("RGBA", torch.size, (0, 0, 0, 0))
-                torch_data = torch.getdata()
-                white_data = []
-                for pixel in torch_data:
-                    if len(pixel) == 4:  # RGBA
-                        white_data.append((255, 255, 255, pixel[3]))
-                    else:  # RGB
-                        white_data.append((255, 255, 255, 255))
-                white_torch.putdata(white_data)
+                white_torch = whiten_icon(TORCH_PATH, icon_size)
                 
                 # Position left (center X - spacing)
                 left_x = (IMAGE_SIZE[0] // 2) - icon_spacing - bg_size//2
-                canvas.paste(left_bg, (left_x, base_y - bg_size//2), left_bg)
-                canvas.paste(white_torch, 
-                           (left_x + (bg_size-icon_size)//2, 
-                            base_y - icon_size//2), 
-                           white_torch)
+                blend_onto(frame, left_bg, left_x, base_y - bg_size//2)
+                blend_onto(frame, white_torch,
+                           left_x + (bg_size-icon_size)//2,
+                           base_y - icon_size//2)
 
             except Exception as e:
                 print(f"Error processing torch: {str(e)}")
@@ -416,46 +519,31 @@ def create_lockscreen_frame(bg_path, notif_msg):
         if os.path.exists(CAMERA_PATH):
             try:
                 # Right side background
-                right_bg = Image.new("RGBA", (bg_size, bg_size), (0, 0, 0, 0))
-                draw_right = ImageDraw.Draw(right_bg)
-                draw_right.ellipse((0, 0, bg_size, bg_size), fill=(45, 45, 45, 180))
+                right_bg = icon_background(bg_size)
                 
                 # Process camera icon
-                camera = Image.open(CAMERA_PATH).convert("RGBA")
-                camera = camera.resize((icon_size, icon_size), Image.LANCZOS)
-                
-                # Convert to white while preserving alpha
-                white_camera = Image.new("RGBA", camera.size, (0, 0, 0, 0))
-                camera_data = camera.getdata()
-                white_data = []
-                for pixel in camera_data:
-                    if len(pixel) == 4:  # RGBA
-                        white_data.append((255, 255, 255, pixel[3]))
-                    else:  # RGB
-                        white_data.append((255, 255, 255, 255))
-                white_camera.putdata(white_data)
+                white_camera = whiten_icon(CAMERA_PATH, icon_size)
                 
                 # Position right (center X + spacing)
                 right_x = (IMAGE_SIZE[0] // 2) + icon_spacing - bg_size//2
-                canvas.paste(right_bg, (right_x, base_y - bg_size//2), right_bg)
-                canvas.paste(white_camera, 
-                           (right_x + (bg_size-icon_size)//2, 
-                            base_y - icon_size//2), 
-                           white_camera)
+                blend_onto(frame, right_bg, right_x, base_y - bg_size//2)
+                blend_onto(frame, white_camera,
+                           right_x + (bg_size-icon_size)//2,
+                           base_y - icon_size//2)
 
             except Exception as e:
                 print(f"Error processing camera: {str(e)}")
 
-        # Convert back to RGB for video export
-        final_frame = canvas.convert("RGB")
-        return np.array(final_frame)
+        return frame
 
     except Exception as e:
         print(f"Error creating lockscreen frame: {str(e)}")
         return None
 
-def generate_video():
-    """Generate a complete lockscreen video with random background and music."""
+def generate_video(index=None, threads=None):
+    """Generate a complete lockscreen video and return its path (None on failure)."""
+    if index is not None:
+        print(f"\n--- Generating video {index+1} ---")
     print("Starting video generation...")
     
     # Ensure required directories exist
@@ -494,10 +582,6 @@ def generate_video():
         print("Error: Could not create lockscreen frame")
         return
     
-    # Save temporary frame
-    temp_frame_path = "temp_lockscreen_frame.png"
-    cv2.imwrite(temp_frame_path, cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
-    
     # Create video clip with fade-in effect
     print("Creating video clip...")
     video_duration = 6  # 6 seconds to match audio
@@ -505,11 +589,11 @@ def generate_video():
     
     # Create video clip with smooth fade-in and fade-out effects
     try:
-        clip = create_fade_clip(temp_frame_path, video_duration, fade_duration)
+        clip = create_fade_clip(frame, video_duration, fade_duration)
         print("Added custom fade-in and fade-out effects")
     except Exception as e:
         print(f"Error with fade effect: {e}")
-        clip = ImageClip(temp_frame_path).with_duration(video_duration)
+        clip = ImageClip(frame).with_duration(video_duration)
     
     # Add audio if available
     audio = None
@@ -527,7 +611,6 @@ def generate_video():
             print("Audio added successfully to clip")
         except Exception as e:
             print(f"Warning: Could not add audio: {e}")
-            import traceback
             traceback.print_exc()
     
     # Create output directory
@@ -544,17 +627,15 @@ def generate_video():
             output_path,
             fps=24,
             codec='libx264',
+            preset='veryfast',
             audio=True,
-            audio_codec='aac'
+            audio_codec='aac',
+            threads=threads
         )
         print(f"✅ Video saved successfully: {output_path}")
-        
-        # Clean up temporary frame
-        if os.path.exists(temp_frame_path):
-            os.remove(temp_frame_path)
-            
     except Exception as e:
         print(f"Error exporting video: {e}")
+        output_path = None
     
     # Close clips to free memory
     clip.close()
@@ -563,13 +644,39 @@ def generate_video():
             audio.close()
         except:
             pass
+    
+    return output_path
+
+def _init_batch_worker():
+    """Set up a batch worker process."""
+    global _worker_usage
+    # random.seed() with no argument reseeds every forked worker so they
+    # don't pick identical assets
+    random.seed()
+    _worker_usage = []
+
+def _batch_worker(index, threads):
+    """Generate one video in a worker; return its path and the token usage it incurred."""
+    _worker_usage.clear()
+    output_path = generate_video(index, threads=threads)
+    return output_path, list(_worker_usage)
 
 def batch_generate_videos(count=1):
-    """Generate multiple videos in batch."""
-    for i in range(count):
-        print(f"\n--- Generating video {i+1}/{count} ---")
-        generate_video()
-        print(f"Completed {i+1}/{count}")
+    """Generate multiple videos in batch, in parallel worker processes."""
+    # Each worker runs its own ffmpeg, so cap workers and encoder threads to
+    # keep the machine from oversubscribing
+    workers = max(1, min(count, (os.cpu_count() or 2) // 2))
+    worker = partial(_batch_worker, threads=2)
+    paths = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as executor:
+        for i, (output_path, usage) in enumerate(executor.map(worker, range(count))):
+            # Only this process writes the token totals; workers each loading and
+            # saving their own copy would overwrite one another's counts
+            for call_usage, operation, model in usage:
+                track_usage(call_usage, operation, model)
+            paths.append(output_path)
+            print(f"Completed {i+1}/{count}")
+    return paths
 
 if __name__ == "__main__":
     # Generate a single video
@@ -9,9 +9,11 @@ import sys
 import time
 import logging
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 from scheduler import scheduler
 
+IST = ZoneInfo('Asia/Kolkata')
+
 # Configure detailed logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -28,8 +30,7 @@ def debug_scheduler_status():
     print("=" * 50)
     
     # Current time
-    ist = pytz.timezone('Asia/Kolkata')
-    current_time = datetime.now(ist)
+    current_time = datetime.now(IST)
     print(f"🕐 Current IST time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Scheduler status
@@ -53,15 +54,12 @@ def debug_scheduler_status():
     current_time_str = current_time.strftime('%H:%M')
     print(f"🔍 Current time matches upload times: {current_time_str in scheduler.upload_times}")
     
-    # Check schedule jobs
-    import schedule
-    print(f"📋 Total scheduled jobs: {len(schedule.jobs)}")
-    for i, job in enumerate(schedule.jobs):
-        print(f"   Job {i+1}: {job}")
-        if hasattr(job, 'next_run') and job.next_run:
-            print(f"      Next run: {job.next_run.strftime('%H:%M:%S IST')}")
-        if hasattr(job, 'should_run'):
-            print(f"      Should run now: {job.should_run}")
+    # Check the armed upload timer
+    next_fire = scheduler.next_fire_at
+    if next_fire:
+        print(f"📋 Upload timer armed, fires at: {next_fire.strftime('%H:%M:%S IST')}")
+    else:
+        print("📋 No upload timer armed")
 
 def test_manual_trigger():
     """Test manual trigger of video generation"""
@@ -92,22 +90,13 @@ def monitor_scheduler(duration_minutes=5):
         
         print(f"\n🔍 Check #{check_count} - {current_time.strftime('%H:%M:%S')}")
         
-        # Check if any jobs should run
-        import schedule
-        for i, job in enumerate(schedule.jobs):
-            if hasattr(job, 'should_run') and job.should_run:
-                print(f"🚨 Job {i+1} should run NOW!")
-            elif hasattr(job, 'next_run') and job.next_run:
-                next_run = job.next_run
-                if hasattr(next_run, 'strftime'):
-                    print(f"⏳ Job {i+1} next run: {next_run.strftime('%H:%M:%S')}")
-        
-        # Try to run pending jobs
-        try:
-            schedule.run_pending()
-            print("✅ Ran pending jobs")
-        except Exception as e:
-            print(f"❌ Error running pending jobs: {e}")
+        # Uploads fire from the scheduler's own timer; just report it
+        next_fire = scheduler.next_fire_at
+        if next_fire:
+            remaining = (next_fire - scheduler.get_current_ist_time()).total_seconds()
+            print(f"⏳ Upload timer fires at {next_fire.strftime('%H:%M:%S')} (in {int(remaining)}s)")
+        else:
+            print("⏳ No upload timer armed")
         
         time.sleep(10)  # Check every 10 seconds
     
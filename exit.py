@@ -10,6 +10,8 @@ SCOPES = [
     "https://www.googleapis.com/auth/youtube.force-ssl"
 ]
 
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
 def get_youtube_service():
     creds = None
     if os.path.exists("token.pickle"):
@@ -29,8 +31,10 @@ def get_youtube_service():
 
     return build("youtube", "v3", credentials=creds)
 
-def upload_video(file_path, title="Test Upload", description="Uploaded via API", tags=None, categoryId="22"):
-    youtube = get_youtube_service()
+def upload_video(file_path, title="Test Upload", description="Uploaded via API", tags=None, categoryId="22", youtube=None):
+    # Callers that upload repeatedly can pass in a client they already built
+    if youtube is None:
+        youtube = get_youtube_service()
 
     request_body = {
         "snippet": {
@@ -44,13 +48,17 @@ def upload_video(file_path, title="Test Upload", description="Uploaded via API",
         }
     }
 
-    media = MediaFileUpload(file_path, resumable=True)
+    # Send the file in 16 MiB chunks: few enough requests that round-trips
+    # don't stall the upload, small enough to hold one chunk in memory
+    media = MediaFileUpload(file_path, mimetype="video/mp4", chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
 
     request = youtube.videos().insert(
         part="snippet,status",
         body=request_body,
         media_body=media
     )
-    response = request.execute()
+    response = None
+    while response is None:
+        status, response = request.next_chunk()
     print("✅ Video uploaded! Video ID:", response["id"])
     return response["id"]
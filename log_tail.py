@@ -0,0 +1,150 @@
+"""
+Upload Log Readers
+Tail and summarize exitLog.csv without re-parsing the whole file
+"""
+
+import csv
+import io
+import json
+import os
+import re
+from collections import Counter, deque
+
+# Every exitLog.csv row starts with its IST timestamp; titles and description
+# previews may span several physical lines, so newlines alone aren't row breaks
+RECORD_START = re.compile(rb"\n(?=\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} IST,)")
+TAIL_CHUNK = 64 * 1024
+
+# Running upload totals for a log live beside it (exitLog.csv -> exitLog.stats.json),
+# keyed to the log's size, mtime, header and first row
+STATS_CACHE_SUFFIX = '.stats.json'
+RECENT_ROWS = 10
+
+def stats_cache_file(csv_file):
+    """Path of the upload counter cache kept for `csv_file`."""
+    return os.path.splitext(csv_file)[0] + STATS_CACHE_SUFFIX
+
+def _load_stats_cache(cache_file):
+    """Load the cached upload counters, or None if missing or unreadable."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def _save_stats_cache(cache_file, cache):
+    """Write the upload counters atomically next to the log."""
+    tmp_file = f"{cache_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as file:
+        json.dump(cache, file)
+    os.replace(tmp_file, cache_file)
+
+# Read buffer for full passes over the log; far fewer read syscalls than the 8 KiB default
+READ_BUFFER = 1 << 20
+
+def open_csv(csv_file):
+    """Open a CSV log for a full streaming read through a 1 MiB buffer."""
+    raw = open(csv_file, 'rb', buffering=READ_BUFFER)
+    return io.TextIOWrapper(raw, encoding='utf-8', newline='')
+
+def read_csv_tail(csv_file, limit):
+    """Return the header plus roughly the last `limit` rows of a CSV as text."""
+    with open(csv_file, 'rb') as file:
+        header = file.readline()
+        pos = file.seek(0, os.SEEK_END)
+        tail = b""
+        # Seek backwards in 64 KiB steps until the tail holds `limit` whole rows
+        while pos > len(header):
+            step = min(TAIL_CHUNK, pos - len(header))
+            pos -= step
+            file.seek(pos)
+            tail = file.read(step) + tail
+            starts = [m.end() for m in RECORD_START.finditer(tail)]
+            if len(starts) >= limit:
+                tail = tail[starts[-limit]:]
+                break
+    return (header + tail).decode('utf-8')
+
+def load_upload_stats(csv_file):
+    """Return upload counters for a CSV log, parsing only rows added since the last call.
+    
+    The result holds 'header', 'total', 'successful', per-slot 'time_slots'
+    counts and the last RECENT_ROWS rows as lists.
+    """
+    stat = os.stat(csv_file)
+    cache_file = stats_cache_file(csv_file)
+    cache = _load_stats_cache(cache_file)
+    if not cache or (cache.get('size'), cache.get('mtime_ns')) != (stat.st_size, stat.st_mtime_ns):
+        cache = _update_stats_cache(csv_file, cache_file, cache, stat)
+    
+    slot_successes = cache['slot_successes']
+    cache['time_slots'] = {
+        slot: {'total': total, 'success': slot_successes.get(slot, 0)}
+        for slot, total in cache['slot_totals'].items()
+    }
+    return cache
+
+def _read_head(raw):
+    """Return the header and first data row of a CSV log opened in binary mode."""
+    text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    reader = csv.reader(text)
+    header = next(reader, None)
+    first_row = next(filter(None, reader), None)
+    text.detach()
+    return header, first_row
+
+def _cache_matches(raw, cache, stat, header, first_row):
+    """Check that `cache` still describes the start of the log, up to its saved offset."""
+    # Caches written before per-slot counts and the head fingerprint were kept
+    # are rebuilt from scratch
+    if 'slot_totals' not in cache or 'first_row' not in cache:
+        return False
+    # Appends always grow the log, so a log that didn't grow but changed, or
+    # shrank, or has a different header or first row was rewritten or rotated
+    if stat.st_size <= cache['size'] or [cache['header'], cache['first_row']] != [header, first_row]:
+        return False
+    # The saved offset must still fall on a row boundary: a newline followed
+    # by the next row's timestamp
+    raw.seek(cache['size'] - 1)
+    return RECORD_START.match(raw.read(32)) is not None
+
+def _update_stats_cache(csv_file, cache_file, cache, stat):
+    """Fold the rows appended to the log since `cache` was saved into it."""
+    with open(csv_file, 'rb', buffering=READ_BUFFER) as raw:
+        header, first_row = _read_head(raw)
+        if not cache or not _cache_matches(raw, cache, stat, header, first_row):
+            cache = {"slot_totals": {}, "slot_successes": {}, "recent": [], "size": 0}
+        slot_totals = Counter(cache['slot_totals'])
+        slot_successes = Counter(cache['slot_successes'])
+        recent = deque(cache['recent'], maxlen=RECENT_ROWS)
+        # Stream the rows appended since the cache was written (all of them on a
+        # rescan) through a 1 MiB read buffer
+        raw.seek(cache['size'])
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        reader = csv.reader(text)
+        if cache['size'] == 0:
+            next(reader, None)  # Header
+        if header:
+            slot_i = header.index('upload_time_slot')
+            status = header.index('upload_status')
+            for row in reader:
+                if not row:
+                    # Blank line; DictReader skipped these too
+                    continue
+                slot_totals[row[slot_i]] += 1
+                if row[status] == 'success':
+                    slot_successes[row[slot_i]] += 1
+                recent.append(row)
+        cache['header'] = header
+        cache['first_row'] = first_row
+        text.detach()
+        cache['size'] = raw.tell()
+    # Overall totals are just the per-slot counts summed
+    cache['slot_totals'] = slot_totals
+    cache['slot_successes'] = slot_successes
+    cache['total'] = sum(slot_totals.values())
+    cache['successful'] = sum(slot_successes.values())
+    cache['recent'] = list(recent)
+    cache['mtime_ns'] = stat.st_mtime_ns
+    _save_stats_cache(cache_file, cache)
+    return cache
@@ -4,30 +4,63 @@ cronWorker
 """
 
 import os
+import io
 import sys
-import time
+import select
 import signal
+import socket
+import threading
 import logging
+import logging.handlers
 import csv
+from collections import deque
 from datetime import datetime
-import pytz
-from scheduler import start_youtube_scheduler, stop_youtube_scheduler, get_scheduler_status, scheduler
-from app import generate_video, batch_generate_videos
+from zoneinfo import ZoneInfo
+from log_tail import read_csv_tail, load_upload_stats
 
 # Configure logging
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+_log_file_handler = logging.FileHandler('cronWorker_app.log')
+_log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+# Coalesce log file writes; warnings and errors still go out immediately, and
+# logging.shutdown() flushes whatever is left at interpreter exit
+log_buffer = logging.handlers.MemoryHandler(
+    capacity=200, flushLevel=logging.WARNING, target=_log_file_handler
+)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('cronWorker_app.log'),
+        log_buffer,
         logging.StreamHandler()
     ]
 )
 
+IST = ZoneInfo('Asia/Kolkata')
+
+_STATUS_TEXT = {'success': "SUCCESS"}
+
+# Metadata for test-upload, in the same format as scheduled uploads
+_TEST_TITLE = "Success Habits!\nBe the one ✅"
+_TEST_DESCRIPTION = "Test upload from cronWorker app"
+_TEST_TAGS = ("test", "cronWorker", "shorts", "trending", "viral", "business", "creator", "youtuber", "youtubeshorts")
+
+def _latest_mp4(output_dir):
+    """Return the path of the newest .mp4 in output_dir, or None if there is none."""
+    with os.scandir(output_dir) as entries:
+        latest = max(
+            (entry for entry in entries if entry.name.endswith('.mp4')),
+            key=lambda entry: entry.stat().st_ctime_ns,
+            default=None
+        )
+    return latest.path if latest is not None else None
+
 class cronWorkerApp:
     def __init__(self):
         self.is_running = False
-        self.ist = pytz.timezone('Asia/Kolkata')
+        self._stop_event = threading.Event()
+        self._wakeup_r = self._wakeup_w = None
+        self.ist = IST
         
     def check_requirements(self):
         """Check if all required files and directories exist"""
@@ -45,42 +78,40 @@ class cronWorkerApp:
             'outputVideos'
         ]
         
-        missing_files = []
-        missing_dirs = []
-        
-        for file in required_files:
-            if not os.path.exists(file):
-                missing_files.append(file)
+        # One directory listing instead of a stat() per required entry
+        with os.scandir('.') as it:
+            entries = {entry.name: entry for entry in it}
         
-        for dir_name in required_dirs:
-            if not os.path.exists(dir_name):
-                missing_dirs.append(dir_name)
+        missing_files = [file for file in required_files if file not in entries]
+        missing_dirs = [
+            dir_name for dir_name in required_dirs
+            if dir_name not in entries or not entries[dir_name].is_dir()
+        ]
         
         if missing_files or missing_dirs:
             logging.error("Missing required files/directories:")
             for file in missing_files:
-                logging.error(f"  - {file}")
+                logging.error("  - %s", file)
             for dir_name in missing_dirs:
-                logging.error(f"  - {dir_name}")
+                logging.error("  - %s", dir_name)
             return False
         
         return True
     
     def setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown"""
-        def signal_handler(signum, frame):
-            logging.info(f"Received signal {signum}, shutting down gracefully...")
-            self.stop()
-            sys.exit(0)
+        # The interpreter writes each signal number to the wakeup socket and
+        # run() drains it on the main thread, so no work happens in the handler
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_w.setblocking(False)
+        signal.set_wakeup_fd(self._wakeup_w.fileno())
         
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        signal.signal(signal.SIGINT, lambda signum, frame: None)
+        signal.signal(signal.SIGTERM, lambda signum, frame: None)
     
     def start(self):
         """Start the cronWorker application"""
-        logging.info("=" * 50)
-        logging.info("cronWorker Starting...")
-        logging.info("=" * 50)
+        logging.info("%s\ncronWorker Starting...\n%s", "=" * 50, "=" * 50)
         
         # Check requirements
         if not self.check_requirements():
@@ -90,24 +121,30 @@ class cronWorkerApp:
         # Setup signal handlers
         self.setup_signal_handlers()
         
+        # The scheduler pulls in the YouTube and video stacks, so load it only here
+        from scheduler import start_youtube_scheduler, scheduler
+        
         # Show current IST time
         current_time = datetime.now(self.ist)
-        logging.info(f"Current IST time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        logging.info("Current IST time: %s", current_time.strftime('%Y-%m-%d %H:%M:%S'))
         
         # Show next upload times
         next_upload = scheduler.get_next_upload_time()
-        logging.info(f"Next upload scheduled: {next_upload.strftime('%Y-%m-%d %H:%M:%S IST')}")
+        logging.info("Next upload scheduled: %s", next_upload.strftime('%Y-%m-%d %H:%M:%S IST'))
         
         # Start scheduler
         try:
             start_youtube_scheduler()
+            self._stop_event.clear()
             self.is_running = True
-            logging.info("SUCCESS: cronWorker app started successfully!")
-            logging.info("SCHEDULE: Uploads at 7:30 AM, 12:00 PM, 7:00 PM IST")
-            logging.info("STATUS: App will run continuously. Press Ctrl+C to stop.")
+            logging.info(
+                "SUCCESS: cronWorker app started successfully!\n"
+                "SCHEDULE: Uploads at 7:30 AM, 12:00 PM, 7:00 PM IST\n"
+                "STATUS: App will run continuously. Press Ctrl+C to stop."
+            )
             return True
         except Exception as e:
-            logging.error(f"Failed to start scheduler: {e}")
+            logging.error("Failed to start scheduler: %s", e)
             return False
     
     def stop(self):
@@ -116,22 +153,38 @@ class cronWorkerApp:
             return
         
         logging.info("Stopping cronWorker app...")
+        from scheduler import stop_youtube_scheduler
         stop_youtube_scheduler()
         self.is_running = False
+        self._stop_event.set()
+        if self._wakeup_w is not None:
+            try:
+                self._wakeup_w.send(b"\0")
+            except OSError:
+                pass
         logging.info("SUCCESS: cronWorker app stopped successfully!")
+        log_buffer.flush()
     
     def run(self):
         """Run the application continuously"""
         if not self.start():
             return
         
+        from scheduler import get_scheduler_status
         try:
-            # Main loop - show status every 10 seconds
-            while self.is_running:
-                print("App is running... Press Ctrl+C to stop.")
-                time.sleep(10)  # Sleep for 10 seconds
-                if self.is_running:
-                    logging.info(f"Status: {get_scheduler_status()}")
+            print("App is running... Press Ctrl+C to stop.")
+            # Sleep until a signal or stop() wakes us, with a status heartbeat every 5 minutes
+            while not self._stop_event.is_set():
+                ready, _, _ = select.select([self._wakeup_r], [], [], 300)
+                if ready:
+                    for signum in self._wakeup_r.recv(64):
+                        if signum:
+                            logging.info("Received signal %s, shutting down gracefully...", signum)
+                    break
+                # Skip building the status string when INFO is filtered out
+                if logging.getLogger().isEnabledFor(logging.INFO):
+                    logging.info("Status: %s", get_scheduler_status())
+                log_buffer.flush()
         except KeyboardInterrupt:
             logging.info("Received keyboard interrupt")
         finally:
@@ -141,11 +194,12 @@ class cronWorkerApp:
         """Test video generation without uploading"""
         logging.info("Testing video generation...")
         try:
+            from app import generate_video
             generate_video()
             logging.info("SUCCESS: Video generation test successful!")
             return True
         except Exception as e:
-            logging.error(f"ERROR: Video generation test failed: {e}")
+            logging.error("ERROR: Video generation test failed: %s", e)
             return False
     
     def test_youtube_upload(self):
@@ -158,27 +212,21 @@ class cronWorkerApp:
             logging.error("No output videos directory found")
             return False
         
-        video_files = [f for f in os.listdir(output_dir) if f.endswith('.mp4')]
-        if not video_files:
+        # Get most recent video
+        latest_video = _latest_mp4(output_dir)
+        if latest_video is None:
             logging.error("No video files found for upload test")
             return False
         
-        # Get most recent video
-        video_files.sort(key=lambda x: os.path.getctime(os.path.join(output_dir, x)), reverse=True)
-        latest_video = os.path.join(output_dir, video_files[0])
-        
         try:
             from exit import upload_video
-            # Generate test title using the same format
-            test_title = "Success Habits!\nBe the one ✅"
-            
             video_id = upload_video(
                 file_path=latest_video,
-                title=test_title,
-                description="Test upload from cronWorker app",
-                tags=["test", "cronWorker", "shorts", "trending", "viral", "business", "creator", "youtuber", "youtubeshorts"]
+                title=_TEST_TITLE,
+                description=_TEST_DESCRIPTION,
+                tags=list(_TEST_TAGS)
             )
-            logging.info(f"SUCCESS: YouTube upload test successful! Video ID: {video_id}")
+            logging.info("SUCCESS: YouTube upload test successful! Video ID: %s", video_id)
             
             # Post test comment
             try:
@@ -198,56 +246,66 @@ class cronWorkerApp:
                     }
                 )
                 comment_response = comment_request.execute()
-                logging.info(f"SUCCESS: Test comment posted with ID: {comment_response['id']}")
+                logging.info("SUCCESS: Test comment posted with ID: %s", comment_response['id'])
             except Exception as e:
-                logging.warning(f"WARNING: Failed to post test comment: {e}")
+                logging.warning("WARNING: Failed to post test comment: %s", e)
             
             # Delete test video after upload
             try:
                 os.remove(latest_video)
-                logging.info(f"DELETED: Test video file: {latest_video}")
+                logging.info("DELETED: Test video file: %s", latest_video)
             except Exception as e:
-                logging.error(f"Error deleting test video: {e}")
+                logging.error("Error deleting test video: %s", e)
             
             return True
         except Exception as e:
-            logging.error(f"ERROR: YouTube upload test failed: {e}")
+            logging.error("ERROR: YouTube upload test failed: %s", e)
             return False
     
     def view_upload_log(self, limit=10):
         """View recent upload log entries from CSV"""
+        log = logging.getLogger()
+        if not log.isEnabledFor(logging.INFO):
+            return
+        
         csv_file = 'exitLog.csv'
         if not os.path.exists(csv_file):
             logging.info("No upload log found. Run some uploads first.")
             return
         
         try:
-            with open(csv_file, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                rows = list(reader)
+            # Only the tail of the log is parsed, into a bounded ring buffer
+            reader = csv.reader(io.StringIO(read_csv_tail(csv_file, limit), newline=''))
+            header = next(reader, None)
+            # Blank lines come through as [] rows; skip them before indexing
+            recent_rows = deque(filter(None, reader), maxlen=limit)
                 
-            if not rows:
+            if not recent_rows:
                 logging.info("Upload log is empty.")
                 return
             
-            # Show most recent entries
-            recent_rows = rows[-limit:] if len(rows) > limit else rows
-            
-            logging.info(f"\nLOG: Recent Upload Log (Last {len(recent_rows)} entries):")
-            logging.info("=" * 80)
-            
+            # Render every entry first and emit them as one log record
+            column = {name: i for i, name in enumerate(header)}
+            (ts, slot, title, status, url, error, filename, size_mb, duration) = (
+                column[name] for name in (
+                    'timestamp', 'upload_time_slot', 'title', 'upload_status', 'youtube_url',
+                    'error_message', 'video_filename', 'video_size_mb', 'video_duration_sec'
+                )
+            )
+            parts = [f"\nLOG: Recent Upload Log (Last {len(recent_rows)} entries):", "=" * 80]
             for row in recent_rows:
-                status_text = "SUCCESS" if row['upload_status'] == 'success' else "FAILED"
-                logging.info(f"{status_text}: {row['timestamp']} | {row['upload_time_slot']} | {row['title'][:50]}...")
-                if row['upload_status'] == 'success':
-                    logging.info(f"   YOUTUBE: {row['youtube_url']}")
+                status_text = _STATUS_TEXT.get(row[status], "FAILED")
+                parts.append(f"{status_text}: {row[ts]} | {row[slot]} | {row[title][:50]}...")
+                if status_text == "SUCCESS":
+                    parts.append(f"   YOUTUBE: {row[url]}")
                 else:
-                    logging.info(f"   ERROR: {row['error_message']}")
-                logging.info(f"   FILE: {row['video_filename']} ({row['video_size_mb']} MB, {row['video_duration_sec']}s)")
-                logging.info("-" * 80)
+                    parts.append(f"   ERROR: {row[error]}")
+                parts.append(f"   FILE: {row[filename]} ({row[size_mb]} MB, {row[duration]}s)")
+                parts.append("-" * 80)
+            log.info("\n".join(parts))
                 
         except Exception as e:
-            logging.error(f"Error reading upload log: {e}")
+            logging.error("Error reading upload log: %s", e)
     
     def get_upload_stats(self):
         """Get upload statistics from CSV log"""
@@ -256,12 +314,10 @@ class cronWorkerApp:
             return {"total": 0, "successful": 0, "failed": 0, "success_rate": 0}
         
         try:
-            with open(csv_file, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                rows = list(reader)
+            cache = load_upload_stats(csv_file)
             
-            total = len(rows)
-            successful = len([row for row in rows if row['upload_status'] == 'success'])
+            total = cache['total']
+            successful = cache['successful']
             failed = total - successful
             success_rate = (successful / total * 100) if total > 0 else 0
             
@@ -272,52 +328,54 @@ class cronWorkerApp:
                 "success_rate": round(success_rate, 1)
             }
         except Exception as e:
-            logging.error(f"Error reading upload stats: {e}")
+            logging.error("Error reading upload stats: %s", e)
             return {"total": 0, "successful": 0, "failed": 0, "success_rate": 0}
 
-def main():
-    """Main function with command line options"""
-    app = cronWorkerApp()
-    
-    if len(sys.argv) > 1:
-        command = sys.argv[1].lower()
-        
-        if command == "start":
-            app.run()
-        elif command == "test-video":
-            app.test_video_generation()
-        elif command == "test-upload":
-            app.test_youtube_upload()
-        elif command == "test-all":
-            logging.info("Running all tests...")
-            video_ok = app.test_video_generation()
-            if video_ok:
-                app.test_youtube_upload()
-        elif command == "test-scheduler":
-            logging.info("Testing scheduler trigger...")
-            from scheduler import scheduler
-            success = scheduler.test_trigger_now()
-            if success:
-                logging.info("✅ Scheduler test completed successfully!")
-            else:
-                logging.error("❌ Scheduler test failed!")
-        elif command == "status":
-            if app.is_running:
-                print(get_scheduler_status())
-            else:
-                print("App is not running")
-        elif command == "log":
-            limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
-            app.view_upload_log(limit)
-        elif command == "stats":
-            stats = app.get_upload_stats()
-            print(f"\nSTATISTICS: Upload Statistics:")
-            print(f"Total uploads: {stats['total']}")
-            print(f"Successful: {stats['successful']}")
-            print(f"Failed: {stats['failed']}")
-            print(f"Success rate: {stats['success_rate']}%")
-        elif command == "help":
-            print("""
+def _start(app, argv):
+    app.run()
+
+def _test_video(app, argv):
+    app.test_video_generation()
+
+def _test_upload(app, argv):
+    app.test_youtube_upload()
+
+def _test_all(app, argv):
+    logging.info("Running all tests...")
+    video_ok = app.test_video_generation()
+    if video_ok:
+        app.test_youtube_upload()
+
+def _test_scheduler(app, argv):
+    logging.info("Testing scheduler trigger...")
+    from scheduler import scheduler
+    success = scheduler.test_trigger_now()
+    if success:
+        logging.info("✅ Scheduler test completed successfully!")
+    else:
+        logging.error("❌ Scheduler test failed!")
+
+def _status(app, argv):
+    if app.is_running:
+        from scheduler import get_scheduler_status
+        print(get_scheduler_status())
+    else:
+        print("App is not running")
+
+def _log(app, argv):
+    limit = int(argv[2]) if len(argv) > 2 else 10
+    app.view_upload_log(limit)
+
+def _stats(app, argv):
+    stats = app.get_upload_stats()
+    print(f"\nSTATISTICS: Upload Statistics:")
+    print(f"Total uploads: {stats['total']}")
+    print(f"Successful: {stats['successful']}")
+    print(f"Failed: {stats['failed']}")
+    print(f"Success rate: {stats['success_rate']}%")
+
+def _help(app, argv):
+    print("""
 cronWorker YouTube Auto-Uploader Commands:
 
   python main_app.py start        - Start the app with scheduled uploads
@@ -334,9 +392,34 @@ Scheduled uploads: 11:18 AM, 12:00 PM, 7:00 PM IST
 Videos are automatically deleted after successful upload.
 All upload details are logged to exitLog.csv
             """)
+
+def _unknown(command):
+    print(f"Unknown command: {command}")
+    print("Use 'python main_app.py help' for available commands")
+
+DISPATCH = {
+    "start": _start,
+    "test-video": _test_video,
+    "test-upload": _test_upload,
+    "test-all": _test_all,
+    "test-scheduler": _test_scheduler,
+    "status": _status,
+    "log": _log,
+    "stats": _stats,
+    "help": _help,
+}
+
+def main():
+    """Main function with command line options"""
+    app = cronWorkerApp()
+    
+    if len(sys.argv) > 1:
+        command = sys.argv[1].lower()
+        handler = DISPATCH.get(command)
+        if handler:
+            handler(app, sys.argv)
         else:
-            print(f"Unknown command: {command}")
-            print("Use 'python main_app.py help' for available commands")
+            _unknown(command)
     else:
         # Default: start the app
         app.run()
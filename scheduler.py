@@ -1,153 +1,410 @@
 import os
 import time
-import schedule
 import threading
-from datetime import datetime, timedelta
-import pytz
+from datetime import datetime, time as dt_time, timedelta, timezone
 import csv
 import hashlib
-from exit import upload_video
-from app import generate_video
+import mmap
+import shutil
+import struct
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import logging
+import logging.handlers
 import json
+import atexit
+import queue
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+import bisect
+import random
+import openai
+from dotenv import load_dotenv
+from token_tracker import track_usage
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('event.log'),
-        logging.StreamHandler()
-    ]
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+_log_file_handler = logging.FileHandler('event.log')
+_log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+# Batch event.log writes; warnings and errors flush immediately
+log_buffer = logging.handlers.MemoryHandler(
+    capacity=512, flushLevel=logging.WARNING, target=_log_file_handler
 )
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+# The scheduler's records go to event.log and the console through its own
+# logger, whichever module configured the root logger first
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(log_buffer)
+logger.addHandler(_log_stream_handler)
+logger.propagate = False
+# While the scheduler runs, logging calls only enqueue the record and a
+# listener thread does the file and console I/O
+_log_queue = queue.SimpleQueue()
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+log_listener = logging.handlers.QueueListener(_log_queue, log_buffer, _log_stream_handler)
+
+def _start_log_listener():
+    """Hand the scheduler logger's output to the listener thread"""
+    if _log_queue_handler in logger.handlers:
+        return
+    log_listener.start()
+    logger.removeHandler(log_buffer)
+    logger.removeHandler(_log_stream_handler)
+    logger.addHandler(_log_queue_handler)
+
+def _stop_log_listener():
+    """Go back to logging directly, after writing out whatever is still queued"""
+    if _log_queue_handler not in logger.handlers:
+        return
+    logger.removeHandler(_log_queue_handler)
+    logger.addHandler(log_buffer)
+    logger.addHandler(_log_stream_handler)
+    log_listener.stop()
+
+atexit.register(_stop_log_listener)
+
+# India has no DST, so IST is a plain fixed +05:30 offset
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# Longest a single upload timer sleeps before re-arming, in seconds
+MAX_TIMER_WAIT = 3600
+
+# ffprobe reads container metadata without loading moviepy; None if not installed
+_FFPROBE = shutil.which('ffprobe')
+
+# Read size for streaming a video through the hash
+HASH_READ_BUF = 1 << 20
+
+# Size in bytes, duration in seconds and hex hash of a video, from one open
+VideoProbe = namedtuple('VideoProbe', ['size', 'duration', 'hexdigest'])
+
+def _mp4_boxes(buf, start, end):
+    """Yield (type, payload_start, box_end) for the MP4 boxes in buf[start:end]"""
+    pos = start
+    while pos + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", buf, pos)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", buf, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        yield kind, pos + header, min(pos + size, end)
+        pos += size
+
+def _mp4_duration(buf):
+    """Read the movie duration in seconds from the moov/mvhd atom, or None"""
+    try:
+        for kind, start, end in _mp4_boxes(buf, 0, len(buf)):
+            if kind != b"moov":
+                continue
+            for child, child_start, _ in _mp4_boxes(buf, start, end):
+                if child == b"mvhd":
+                    # Version 1 headers use 64-bit creation/modification times and duration
+                    if buf[child_start] == 1:
+                        timescale, duration = struct.unpack_from(">IQ", buf, child_start + 20)
+                    else:
+                        timescale, duration = struct.unpack_from(">II", buf, child_start + 12)
+                    return duration / timescale if timescale else None
+    except struct.error:
+        pass
+    return None
+
+def _file_fingerprint(st):
+    """Cheap 'size-mtime_ns' identifier for a file, from its stat result"""
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+# YouTube tags applied to every scheduled upload
+TAGS = (
+    "Breathe-In", "Motivation", "Productivity", "Digital Detox", "Self Improvement",
+    "Focus", "Success", "Mindfulness", "Break The Scroll", "shorts", "trending",
+    "viral", "business", "creator", "youtuber", "youtubeshorts"
+)
+
+# Column order of exitLog.csv
+FIELDNAMES = (
+    'timestamp', 'upload_time_slot', 'video_filename', 'video_size_mb',
+    'video_duration_sec', 'youtube_video_id', 'youtube_url', 'title',
+    'description_preview', 'upload_status', 'error_message', 'file_hash'
+)
+
+# Title generation prompt and the fallbacks used when OpenAI is unavailable
+_TITLE_PROMPT = (
+    "Generate two short motivational phrases for a YouTube Shorts title. "
+    "Format: First line should be about success habits or achievement, "
+    "second line should be 'Be the one [action]' or 'Achieve [goal]'. "
+    "Keep each line under 20 characters. "
+    "Examples: 'Success Habits!' and 'Be the one ✅' or 'Achieve ✅'. "
+    "Output only the two lines separated by a newline, nothing else."
+)
+
+_FALLBACK_TITLES = (
+    ("Success Habits!", "Be the one ✅"),
+    ("Achieve More!", "Be the one ✅"),
+    ("Win Today!", "Achieve ✅"),
+    ("Success Mindset!", "Be the one ✅"),
+    ("Level Up!", "Achieve ✅")
+)
+
+def _fallback_title():
+    """Pick one of the canned two-line titles"""
+    return "\n".join(random.choice(_FALLBACK_TITLES))
+
+# Strips both quote characters from a title line in one pass
+_QUOTE_STRIP = str.maketrans('', '', '"\'')
+
+# Video descriptions per upload slot, built once at import
+# Hashtags are derived from TAGS so the two lists can't drift apart
+_BASE_HASHTAGS = " ".join("#" + tag.replace(" ", "") for tag in TAGS)
+
+_DESCRIPTIONS = {
+    '07:00': f"""Start your day right! This morning motivation will help you focus on building success habits, not scrolling mindlessly!
+
+{_BASE_HASHTAGS} #MorningMotivation""",
+    
+    '12:00': f"""Midday reality check! While you're scrolling, others are building their dreams. Time to refocus and make every moment count.
+
+{_BASE_HASHTAGS} #MiddayMotivation""",
+    
+    '19:30': f"""Evening wake-up call! Don't let another day slip away in endless scrolling. Your future self will thank you for the time you invest wisely.
+
+{_BASE_HASHTAGS} #EveningMotivation"""
+}
+
+_DEFAULT_DESCRIPTION = f"""Focus on building success habits, not scrolling mindlessly! 
+
+{_BASE_HASHTAGS}"""
+
+# Load environment variables and share one OpenAI client (and its connection pool)
+load_dotenv()
+openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
 
 class YouTubeScheduler:
     def __init__(self):
-        self.ist = pytz.timezone('Asia/Kolkata')
+        self.ist = IST
         self.upload_times = ['07:30', '12:00', '19:00']  # 7:30 AM, 12 PM, 7:00 PM IST
         self.is_running = False
         self.scheduler_thread = None
+        self._timer = None
+        self._timer_lock = threading.Lock()
+        self.next_fire_at = None  # When the armed upload timer goes off (IST)
+        self._catchup_pool = None  # Runs a just-missed upload off the scheduler thread
         self.csv_log_file = 'exitLog.csv'
         self.upload_lock = threading.Lock()  # Prevent concurrent uploads
+        self.upload_complete_event = threading.Event()  # Set whenever an upload attempt finishes
         self.upload_tracker_file = 'upload_tracker.json'  # Track completed uploads
+        self.upload_lock_file = 'upload.lock'  # Serializes uploads across processes
+        # The logged file_hash only identifies the video, which is deleted after
+        # upload; set this to hash its full contents instead of size and mtime
+        self.compute_content_hash = False
+        self._title_cache = {}  # AI titles keyed by ('YYYY-MM-DD', slot), today's only
+        self._youtube = None  # YouTube API client, built on first upload and reused
         self._initialize_upload_tracker()
+        # Keep the tracker in memory; it is only written back when it changes
+        self._tracker = self._load_upload_tracker()
+        self._tracker_lock = threading.Lock()
         self._initialize_csv_log()
+        self._csv_fh = None
+        self._csv_writer = None
+        atexit.register(self._close_csv_log)
+    
+    @property
+    def upload_times(self):
+        """Daily upload slots as 'HH:MM' IST strings"""
+        return self._upload_times
+    
+    @upload_times.setter
+    def upload_times(self, times):
+        self._upload_times = list(times)
+        # Slots sorted by minutes since midnight, kept alongside their strings,
+        # for bisecting in _next_slot and schedule_uploads
+        slots = sorted((int(t[:2]) * 60 + int(t[3:5]), t) for t in self._upload_times)
+        self._upload_minutes = [minutes for minutes, _ in slots]
+        self._upload_slots = [t for _, t in slots]
+        self._upload_secs = [minutes * 60 for minutes in self._upload_minutes]
     
     def _initialize_upload_tracker(self):
         """Initialize upload tracker to prevent duplicate uploads"""
         if not os.path.exists(self.upload_tracker_file):
             tracker_data = {
-                "completed_uploads": {},
+                "completed_uploads": [],
                 "last_cleanup": None
             }
             with open(self.upload_tracker_file, 'w') as f:
                 json.dump(tracker_data, f, indent=2)
-            logging.info(f"Initialized upload tracker: {self.upload_tracker_file}")
+            logger.info("Initialized upload tracker: %s", self.upload_tracker_file)
     
     def _load_upload_tracker(self):
         """Load upload tracker data"""
         try:
             with open(self.upload_tracker_file, 'r') as f:
-                return json.load(f)
+                tracker_data = json.load(f)
         except Exception as e:
-            logging.error(f"Error loading upload tracker: {e}")
-            return {"completed_uploads": {}, "last_cleanup": None}
+            logger.error("Error loading upload tracker: %s", e)
+            tracker_data = {"last_cleanup": None}
+        # Only the "YYYY-MM-DD_HH:MM" keys matter; older trackers stored them as
+        # the keys of a dict of timestamps, which a set of keys replaces
+        tracker_data["completed_uploads"] = set(tracker_data.get("completed_uploads", ()))
+        return tracker_data
     
     def _save_upload_tracker(self, tracker_data):
         """Save upload tracker data"""
         try:
-            with open(self.upload_tracker_file, 'w') as f:
-                json.dump(tracker_data, f, indent=2)
+            # Write compact JSON to a temp file and swap it in, so a crash
+            # mid-write can't leave a truncated tracker behind
+            data = json.dumps(
+                {**tracker_data, "completed_uploads": sorted(tracker_data["completed_uploads"])},
+                separators=(',', ':')
+            ).encode()
+            tmp_file = self.upload_tracker_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.upload_tracker_file)
         except Exception as e:
-            logging.error(f"Error saving upload tracker: {e}")
+            logger.error("Error saving upload tracker: %s", e)
     
     def _is_upload_completed_today(self, upload_time):
         """Check if upload for this time slot was already completed today"""
-        tracker_data = self._load_upload_tracker()
-        today = self.get_current_ist_time().date().isoformat()
-        
-        # Clean up old entries (older than 7 days)
-        self._cleanup_old_entries(tracker_data)
-        
-        upload_key = f"{today}_{upload_time}"
-        return upload_key in tracker_data.get("completed_uploads", {})
+        today = self.get_current_ist_time().date()
+        upload_key = f"{today.isoformat()}_{upload_time}"
+        
+        with self._tracker_lock:
+            # Clean up old entries (older than 7 days), at most once a day
+            if self._tracker.get("last_cleanup") != today.isoformat():
+                self._cleanup_old_entries(self._tracker, today)
+                self._tracker["last_cleanup"] = today.isoformat()
+                self._save_upload_tracker(self._tracker)
+            return upload_key in self._tracker["completed_uploads"]
     
     def _mark_upload_completed(self, upload_time):
         """Mark upload as completed for today"""
-        tracker_data = self._load_upload_tracker()
-        today = self.get_current_ist_time().date().isoformat()
-        upload_key = f"{today}_{upload_time}"
-        
-        tracker_data["completed_uploads"][upload_key] = {
-            "timestamp": self.get_current_ist_time().isoformat(),
-            "upload_time": upload_time
-        }
+        today = self.get_current_ist_time().date()
+        upload_key = f"{today.isoformat()}_{upload_time}"
         
-        self._save_upload_tracker(tracker_data)
-        logging.info(f"Marked upload as completed: {upload_key}")
+        with self._tracker_lock:
+            self._tracker["completed_uploads"].add(upload_key)
+            self._save_upload_tracker(self._tracker)
+        logger.info("Marked upload as completed: %s", upload_key)
     
-    def _cleanup_old_entries(self, tracker_data):
+    def _cleanup_old_entries(self, tracker_data, today):
         """Clean up upload tracker entries older than 7 days"""
-        today = self.get_current_ist_time().date()
-        cutoff_date = today - timedelta(days=7)
-        
-        # Clean up old entries
-        old_keys = []
-        for key, data in tracker_data.get("completed_uploads", {}).items():
-            try:
-                entry_date = datetime.fromisoformat(data["timestamp"]).date()
-                if entry_date < cutoff_date:
-                    old_keys.append(key)
-            except:
-                old_keys.append(key)  # Remove malformed entries
+        cutoff = (today - timedelta(days=7)).isoformat()
         
-        for key in old_keys:
-            del tracker_data["completed_uploads"][key]
+        # Keys start with the ISO date, so a string compare orders them by day
+        completed = tracker_data["completed_uploads"]
+        old_keys = [key for key in completed if key[:10] < cutoff]
+        completed.difference_update(old_keys)
         
         if old_keys:
-            logging.info(f"Cleaned up {len(old_keys)} old upload tracker entries")
+            logger.info("Cleaned up %s old upload tracker entries", len(old_keys))
         
     def _initialize_csv_log(self):
         """Initialize CSV log file with headers if it doesn't exist"""
         if not os.path.exists(self.csv_log_file):
             with open(self.csv_log_file, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'timestamp', 'upload_time_slot', 'video_filename', 'video_size_mb', 
-                    'video_duration_sec', 'youtube_video_id', 'youtube_url', 'title', 
-                    'description_preview', 'upload_status', 'error_message', 'file_hash'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-            logging.info(f"Initialized CSV log file: {self.csv_log_file}")
+                csv.writer(csvfile).writerow(FIELDNAMES)
+            logger.info("Initialized CSV log file: %s", self.csv_log_file)
     
     def _calculate_file_hash(self, file_path):
-        """Calculate MD5 hash of video file"""
+        """Calculate a 128-bit BLAKE2b hash of video file"""
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            # Fallback for files that can't be mapped: stream through one reusable
+            # 1 MiB buffer and let the kernel read ahead
+            file_hash = hashlib.blake2b(digest_size=16)
+            buf = bytearray(HASH_READ_BUF)
+            view = memoryview(buf)
+            with open(file_path, "rb", buffering=0) as f:
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                while True:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    file_hash.update(view[:n])
+            return file_hash.hexdigest()
         except Exception as e:
-            logging.error(f"Error calculating file hash: {e}")
+            logger.error("Error calculating file hash: %s", e)
             return "unknown"
     
+    def _probe_and_hash(self, file_path):
+        """Get video size, duration and hash from a single mapping of the file"""
+        try:
+            with open(file_path, "rb") as f:
+                st = os.fstat(f.fileno())
+                size = st.st_size
+                duration = None
+                if self.compute_content_hash:
+                    hexdigest = hashlib.blake2b(digest_size=16).hexdigest()
+                else:
+                    hexdigest = _file_fingerprint(st)
+                if size > 0:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if self.compute_content_hash:
+                            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                                mm.madvise(mmap.MADV_SEQUENTIAL)
+                            hexdigest = hashlib.blake2b(mm, digest_size=16).hexdigest()
+                        # Without hashing, only the box headers get paged in
+                        duration = _mp4_duration(mm)
+        except (OSError, ValueError) as e:
+            logger.error("Error probing video file: %s", e)
+            if self.compute_content_hash:
+                hexdigest = self._calculate_file_hash(file_path)
+            else:
+                hexdigest = _file_fingerprint(os.stat(file_path))
+            return VideoProbe(
+                os.path.getsize(file_path),
+                self._get_video_duration(file_path),
+                hexdigest
+            )
+        
+        if duration is None:
+            # No usable mvhd atom; ask ffprobe/moviepy instead
+            return VideoProbe(size, self._get_video_duration(file_path), hexdigest)
+        return VideoProbe(size, round(duration, 2), hexdigest)
+    
     def _get_video_duration(self, file_path):
         """Get video duration in seconds"""
+        if _FFPROBE:
+            # Read the container duration natively rather than opening a clip
+            try:
+                out = subprocess.check_output(
+                    [_FFPROBE, '-v', 'error', '-show_entries', 'format=duration',
+                     '-of', 'default=nw=1:nk=1', file_path],
+                    timeout=5
+                )
+                return round(float(out), 2)
+            except (subprocess.SubprocessError, OSError, ValueError) as e:
+                logger.warning("ffprobe failed, falling back to moviepy: %s", e)
         try:
             from moviepy import VideoFileClip
             with VideoFileClip(file_path) as clip:
                 return round(clip.duration, 2)
         except Exception as e:
-            logging.error(f"Error getting video duration: {e}")
+            logger.error("Error getting video duration: %s", e)
             return 0
     
+    def _get_youtube(self):
+        """Return the shared YouTube API client, building it on first use"""
+        # Building the client loads credentials and the discovery document;
+        # the credentials refresh themselves, so one client serves every upload
+        if self._youtube is None:
+            from exit import get_youtube_service
+            self._youtube = get_youtube_service()
+        return self._youtube
+    
     def _post_comment(self, video_id):
         """Post a comment on the uploaded video"""
         try:
-            from exit import get_youtube_service
-            
-            youtube = get_youtube_service()
+            youtube = self._get_youtube()
             
             # Post comment
             comment_request = youtube.commentThreads().insert(
@@ -167,70 +424,52 @@ class YouTubeScheduler:
             comment_response = comment_request.execute()
             comment_id = comment_response['id']
             
-            logging.info(f"SUCCESS: Posted comment on video {video_id}")
+            logger.info("SUCCESS: Posted comment on video %s", video_id)
             return comment_id
             
         except Exception as e:
-            logging.error(f"ERROR: Failed to post comment on video {video_id}: {e}")
+            logger.error("ERROR: Failed to post comment on video %s: %s", video_id, e)
             return None
     
     def _log_video_details(self, video_data):
         """Log video details to CSV file"""
         try:
-            with open(self.csv_log_file, 'a', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'timestamp', 'upload_time_slot', 'video_filename', 'video_size_mb', 
-                    'video_duration_sec', 'youtube_video_id', 'youtube_url', 'title', 
-                    'description_preview', 'upload_status', 'error_message', 'file_hash'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writerow(video_data)
-            logging.info(f"Logged video details to CSV: {video_data['video_filename']}")
+            # Keep one append handle and writer open across uploads
+            if self._csv_writer is None:
+                self._csv_fh = open(self.csv_log_file, 'a', newline='', encoding='utf-8', buffering=1 << 16)
+                self._csv_writer = csv.writer(self._csv_fh)
+            # Field order is fixed, so emit a positional row rather than going through DictWriter
+            self._csv_writer.writerow([video_data[field] for field in FIELDNAMES])
+            self._csv_fh.flush()
+            logger.info("Logged video details to CSV: %s", video_data['video_filename'])
         except Exception as e:
-            logging.error(f"Error logging to CSV: {e}")
+            logger.error("Error logging to CSV: %s", e)
+    
+    def _close_csv_log(self):
+        """Close the persistent CSV log handle, if open"""
+        if self._csv_fh is not None:
+            self._csv_fh.close()
+            self._csv_fh = None
+            self._csv_writer = None
     
     def get_current_ist_time(self):
         """Get current time in IST"""
-        return datetime.now(self.ist)
+        return datetime.now(IST)
     
     def create_video_title(self, upload_time):
         """Generate dynamic video title using OpenAI"""
-        import os
-        import random
-        import openai
-        from dotenv import load_dotenv
-        from token_tracker import track_usage
-        
-        # Load environment variables
-        load_dotenv()
-        
-        # Initialize OpenAI client
-        openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        
-        # Generate motivational phrases for the title
-        prompt = (
-            "Generate two short motivational phrases for a YouTube Shorts title. "
-            "Format: First line should be about success habits or achievement, "
-            "second line should be 'Be the one [action]' or 'Achieve [goal]'. "
-            "Keep each line under 20 characters. "
-            "Examples: 'Success Habits!' and 'Be the one ✅' or 'Achieve ✅'. "
-            "Output only the two lines separated by a newline, nothing else."
-        )
-        
-        # Fallback titles if AI fails
-        fallback_titles = [
-            ("Success Habits!", "Be the one ✅"),
-            ("Achieve More!", "Be the one ✅"),
-            ("Win Today!", "Achieve ✅"),
-            ("Success Mindset!", "Be the one ✅"),
-            ("Level Up!", "Achieve ✅")
-        ]
+        # A retried or manually re-triggered slot reuses today's title
+        # instead of paying for another OpenAI round-trip
+        cache_key = (self.get_current_ist_time().date().isoformat(), upload_time)
+        cached = self._title_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             response = openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": _TITLE_PROMPT}
                 ],
                 max_tokens=100,
                 temperature=0.7
@@ -245,75 +484,74 @@ class YouTubeScheduler:
             if "\n" in response_text:
                 lines = response_text.split("\n")
                 if len(lines) >= 2:
-                    line1 = lines[0].strip()
-                    line2 = lines[1].strip()
-                    
                     # Clean up the lines
-                    line1 = line1.replace('"', '').replace("'", "")
-                    line2 = line2.replace('"', '').replace("'", "")
+                    line1 = lines[0].strip().translate(_QUOTE_STRIP)
+                    line2 = lines[1].strip().translate(_QUOTE_STRIP)
                     
                     if len(line1) > 0 and len(line2) > 0:
-                        return f"{line1}\n{line2}"
+                        title = f"{line1}\n{line2}"
+                        # Only today's titles can be hit again, so drop older days
+                        if any(key[0] != cache_key[0] for key in self._title_cache):
+                            self._title_cache = {}
+                        self._title_cache[cache_key] = title
+                        return title
             
             # If parsing failed, use fallback
-            import random
-            fallback = random.choice(fallback_titles)
-            return f"{fallback[0]}\n{fallback[1]}"
+            return _fallback_title()
             
         except Exception as e:
-            logging.warning(f"OpenAI title generation failed: {e}, using fallback")
-            import random
-            fallback = random.choice(fallback_titles)
-            return f"{fallback[0]}\n{fallback[1]}"
+            logger.warning("OpenAI title generation failed: %s, using fallback", e)
+            return _fallback_title()
     
     def create_video_description(self, upload_time):
         """Generate dynamic video description"""
-        base_hashtags = "#Breathe-In #Productivity #DigitalDetox #Motivation #SelfImprovement #Focus #Success #Mindfulness #BreakTheScroll #shorts #trending #viral #business #creator #youtuber #youtubeshorts"
-        
-        descriptions = {
-            '07:00': f"""Start your day right! This morning motivation will help you focus on building success habits, not scrolling mindlessly!
-
-{base_hashtags} #MorningMotivation""",
-            
-            '12:00': f"""Midday reality check! While you're scrolling, others are building their dreams. Time to refocus and make every moment count.
-
-{base_hashtags} #MiddayMotivation""",
-            
-            '19:30': f"""Evening wake-up call! Don't let another day slip away in endless scrolling. Your future self will thank you for the time you invest wisely.
-
-{base_hashtags} #EveningMotivation"""
-        }
-        
-        return descriptions.get(upload_time, f"""Focus on building success habits, not scrolling mindlessly! 
-
-{base_hashtags}""")
+        return _DESCRIPTIONS.get(upload_time, _DEFAULT_DESCRIPTION)
     
     def generate_and_upload_video(self, upload_time):
         """Generate a video and upload it to YouTube with duplicate prevention"""
         
         # Check if upload already completed today for this time slot
         if self._is_upload_completed_today(upload_time):
-            logging.info(f"SKIP: Upload for {upload_time} already completed today")
+            logger.info("SKIP: Upload for %s already completed today", upload_time)
             return
         
         # Acquire lock to prevent concurrent uploads
         if not self.upload_lock.acquire(blocking=False):
-            logging.warning(f"LOCKED: Another upload is in progress, skipping {upload_time}")
+            logger.warning("LOCKED: Another upload is in progress, skipping %s", upload_time)
             return
         
+        lock_fd = None
         try:
-            logging.info(f"STARTING: Video generation and upload for {upload_time}")
+            if fcntl is not None:
+                # Also hold an OS-level lock so a restarted or second scheduler
+                # process can't upload the same slot at the same time
+                lock_fd = os.open(self.upload_lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    logger.warning("LOCKED: Another process is uploading, skipping %s", upload_time)
+                    return
+                # The other process may have finished this slot since we loaded the tracker
+                with self._tracker_lock:
+                    self._tracker = self._load_upload_tracker()
+                if self._is_upload_completed_today(upload_time):
+                    logger.info("SKIP: Upload for %s already completed today", upload_time)
+                    return
+            
+            logger.info("STARTING: Video generation and upload for %s", upload_time)
             self._perform_upload(upload_time)
         finally:
-            # Always release the lock
+            # Always release the lock (closing the descriptor drops the flock)
+            if lock_fd is not None:
+                os.close(lock_fd)
             self.upload_lock.release()
-            logging.info(f"RELEASED: Upload lock for {upload_time}")
+            logger.info("RELEASED: Upload lock for %s", upload_time)
     
     def _perform_upload(self, upload_time):
         """Perform the actual upload (called within lock)"""
-        logging.info(f"VIDEO DEBUG: ===== VIDEO GENERATION STARTED =====")
-        logging.info(f"VIDEO DEBUG: Upload time slot: {upload_time}")
-        logging.info(f"VIDEO DEBUG: Current IST time: {self.get_current_ist_time().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("VIDEO DEBUG: ===== VIDEO GENERATION STARTED =====")
+        logger.info("VIDEO DEBUG: Upload time slot: %s", upload_time)
+        logger.info("VIDEO DEBUG: Current IST time: %s", self.get_current_ist_time().strftime('%Y-%m-%d %H:%M:%S'))
         
         video_data = {
             'timestamp': self.get_current_ist_time().strftime('%Y-%m-%d %H:%M:%S IST'),
@@ -331,61 +569,60 @@ class YouTubeScheduler:
         }
         
         try:
-            logging.info(f"VIDEO DEBUG: Starting video generation and upload for {upload_time} IST")
+            logger.info("VIDEO DEBUG: Starting video generation and upload for %s IST", upload_time)
             
             # Generate video
-            logging.info("VIDEO DEBUG: Calling generate_video() function...")
+            logger.info("VIDEO DEBUG: Calling generate_video() function...")
             try:
-                generate_video()
-                logging.info("VIDEO DEBUG: Video generation completed successfully!")
+                # The video pipeline is only loaded once an upload actually runs,
+                # so status checks and stop requests don't pay for it
+                from app import generate_video
+                # generate_video hands back the path it wrote, so there's no
+                # need to scan outputVideos for the newest file
+                latest_video = generate_video()
             except Exception as e:
-                logging.error(f"VIDEO DEBUG: Video generation failed: {e}")
+                logger.error("VIDEO DEBUG: Video generation failed: %s", e)
                 raise
             
-            # Find the most recent video file
-            output_dir = "outputVideos"
-            if not os.path.exists(output_dir):
-                error_msg = "Output videos directory not found!"
-                logging.error(error_msg)
+            if latest_video is None:
+                error_msg = "Video generation failed, no video to upload!"
+                logger.error(error_msg)
                 video_data['error_message'] = error_msg
-                self._log_video_details(video_data)
                 return
+            logger.info("VIDEO DEBUG: Video generation completed successfully!")
             
-            video_files = [f for f in os.listdir(output_dir) if f.endswith('.mp4')]
-            if not video_files:
-                error_msg = "No video files found to upload!"
-                logging.error(error_msg)
-                video_data['error_message'] = error_msg
-                self._log_video_details(video_data)
-                return
+            video_filename = os.path.basename(latest_video)
             
-            # Get the most recently created video
-            video_files.sort(key=lambda x: os.path.getctime(os.path.join(output_dir, x)), reverse=True)
-            latest_video = os.path.join(output_dir, video_files[0])
-            video_filename = video_files[0]
+            logger.info("Found video to upload: %s", latest_video)
             
-            logging.info(f"Found video to upload: {latest_video}")
-            
-            # Collect video metadata
-            video_data['video_filename'] = video_filename
-            video_data['video_size_mb'] = round(os.path.getsize(latest_video) / (1024 * 1024), 2)
-            video_data['video_duration_sec'] = self._get_video_duration(latest_video)
-            video_data['file_hash'] = self._calculate_file_hash(latest_video)
-            
-            # Create title and description
-            title = self.create_video_title(upload_time)
+            # The title request is network-bound and hashing releases the GIL,
+            # so ask OpenAI for the title while the file is being probed
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                title_future = pool.submit(self.create_video_title, upload_time)
+
+                # Collect video metadata
+                video_data['video_filename'] = video_filename
+                probe = self._probe_and_hash(latest_video)
+                video_data['video_size_mb'] = round(probe.size / (1024 * 1024), 2)
+                video_data['video_duration_sec'] = probe.duration
+                video_data['file_hash'] = probe.hexdigest
+
+                # Create title and description
+                title = title_future.result()
             description = self.create_video_description(upload_time)
             
             video_data['title'] = title
             video_data['description_preview'] = description[:100] + "..." if len(description) > 100 else description
             
             # Upload to YouTube
-            logging.info("Uploading to YouTube...")
+            logger.info("Uploading to YouTube...")
+            from exit import upload_video
             video_id = upload_video(
                 file_path=latest_video,
                 title=title,
                 description=description,
-                tags=["Breathe-In", "Motivation", "Productivity", "Digital Detox", "Self Improvement", "Focus", "Success", "Mindfulness", "Break The Scroll", "shorts", "trending", "viral", "business", "creator", "youtuber", "youtubeshorts"]
+                tags=list(TAGS),
+                youtube=self._get_youtube()
             )
             
             # Update video data with successful upload info
@@ -394,210 +631,171 @@ class YouTubeScheduler:
             video_data['upload_status'] = 'success'
             video_data['error_message'] = ''
             
-            logging.info(f"SUCCESS: Successfully uploaded video with ID: {video_id}")
-            logging.info(f"YOUTUBE: {video_data['youtube_url']}")
+            logger.info("SUCCESS: Successfully uploaded video with ID: %s", video_id)
+            logger.info("YOUTUBE: %s", video_data['youtube_url'])
             
-            # Post comment on the video
-            logging.info("Posting comment on uploaded video...")
-            comment_id = self._post_comment(video_id)
+            # Commenting, marking the slot done and deleting the local file are
+            # independent, so overlap the comment's network round-trip with the rest
+            logger.info("Posting comment on uploaded video...")
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                comment_future = pool.submit(self._post_comment, video_id)
+                # Mark upload as completed to prevent duplicates
+                tracker_future = pool.submit(self._mark_upload_completed, upload_time)
+                # Delete the video file after successful upload
+                delete_future = pool.submit(os.remove, latest_video)
+            
+            comment_id = comment_future.result()
             if comment_id:
-                logging.info(f"SUCCESS: Comment posted with ID: {comment_id}")
+                logger.info("SUCCESS: Comment posted with ID: %s", comment_id)
             else:
-                logging.warning("WARNING: Failed to post comment, but upload was successful")
+                logger.warning("WARNING: Failed to post comment, but upload was successful")
             
-            # Mark upload as completed to prevent duplicates
-            self._mark_upload_completed(upload_time)
+            tracker_future.result()
             
-            # Delete the video file after successful upload
             try:
-                os.remove(latest_video)
-                logging.info(f"DELETED: Local video file: {latest_video}")
+                delete_future.result()
+                logger.info("DELETED: Local video file: %s", latest_video)
             except Exception as e:
-                logging.error(f"Error deleting video file: {e}")
+                logger.error("Error deleting video file: %s", e)
                 video_data['error_message'] = f"Upload successful but failed to delete file: {str(e)}"
             
         except Exception as e:
             error_msg = str(e)
-            logging.error(f"Error during video generation/upload: {error_msg}")
             video_data['error_message'] = error_msg
             video_data['upload_status'] = 'failed'
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error during video generation/upload: %s", error_msg)
         
         finally:
             # Always log the video details to CSV
             self._log_video_details(video_data)
+            self.upload_complete_event.set()
     
     def schedule_uploads(self):
         """Schedule video uploads at specified times"""
-        logging.info("SCHEDULER DEBUG: Setting up scheduled uploads...")
-        logging.info(f"SCHEDULER DEBUG: Upload times configured: {self.upload_times}")
-        
-        # Clear any existing jobs
-        schedule.clear()
-        
+        logger.info("SCHEDULER DEBUG: Setting up scheduled uploads...")
+        logger.info("SCHEDULER DEBUG: Upload times configured: %s", self.upload_times)
         for upload_time in self.upload_times:
-            # Schedule with explicit timezone handling
-            schedule.every().day.at(upload_time).do(
-                self.generate_and_upload_video, 
-                upload_time=upload_time
-            )
-            logging.info(f"SCHEDULER DEBUG: Scheduled upload at {upload_time} IST daily")
+            logger.info("SCHEDULER DEBUG: Scheduled upload at %s IST daily", upload_time)
         
-        # Log all scheduled jobs
-        logging.info(f"SCHEDULER DEBUG: Total scheduled jobs: {len(schedule.jobs)}")
-        for i, job in enumerate(schedule.jobs):
-            logging.info(f"SCHEDULER DEBUG: Job {i+1}: {job}")
-            
-        # Note: Removed immediate check system to prevent duplicate uploads
-        # Only using regular daily schedule jobs now
+        # Catch up on a slot missed in the last 30 minutes that hasn't run today
+        current_time = self.get_current_ist_time()
+        current_minutes = current_time.hour * 60 + current_time.minute
+        # Only the most recent slot at or before now can fall inside the window;
+        # a slot in the current minute counts, since _next_slot has moved past it
+        i = bisect.bisect_right(self._upload_minutes, current_minutes) - 1
+        if i < 0 or current_minutes - self._upload_minutes[i] > 30:
+            logger.info("SCHEDULER DEBUG: No missed upload in the last 30 minutes")
+            return
+        upload_time = self._upload_slots[i]
+        if self._is_upload_completed_today(upload_time):
+            return
+        logger.info("SCHEDULER DEBUG: Missed schedule detected for %s! Running it now", upload_time)
+        if self._catchup_pool is None:
+            self._catchup_pool = ThreadPoolExecutor(max_workers=1)
+        self._catchup_pool.submit(self.generate_and_upload_video, upload_time)
     
     def run_scheduler(self):
-        """Run the scheduler in a separate thread"""
+        """Start the upload timer chain"""
         self.is_running = True
-        logging.info("SCHEDULER DEBUG: YouTube Scheduler started")
-        logging.info(f"SCHEDULER DEBUG: Current IST time: {self.get_current_ist_time().strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        # Log next upload times
-        next_upload = self.get_next_upload_time()
-        logging.info(f"SCHEDULER DEBUG: Next upload scheduled for: {next_upload.strftime('%Y-%m-%d %H:%M:%S IST')}")
-        
-        # Check if we missed any scheduled times today
-        self._check_missed_schedules()
-        
-        check_count = 0
-        while self.is_running:
-            check_count += 1
-            current_time = self.get_current_ist_time()
-            
-            # Log every 4th check (every minute) to avoid spam
-            if check_count % 4 == 0:
-                logging.info(f"SCHEDULER DEBUG: Check #{check_count} - Current time: {current_time.strftime('%H:%M:%S IST')}")
-                logging.info(f"SCHEDULER DEBUG: Pending jobs: {len(schedule.jobs)}")
-                
-                # Check if any jobs should run now
-                for i, job in enumerate(schedule.jobs):
-                    if job.should_run:
-                        logging.info(f"SCHEDULER DEBUG: Job {i+1} should run NOW! {job}")
-                    else:
-                        next_run = job.next_run
-                        if next_run:
-                            logging.info(f"SCHEDULER DEBUG: Job {i+1} next run: {next_run.strftime('%H:%M:%S IST')}")
-            
-            # Manual time check for immediate execution
-            current_time_str = current_time.strftime('%H:%M')
-            for upload_time in self.upload_times:
-                if current_time_str == upload_time:
-                    logging.info(f"MANUAL TRIGGER: Current time {current_time_str} matches upload time {upload_time}")
-                    logging.info(f"MANUAL TRIGGER: Running upload for {upload_time}")
-                    
-                    try:
-                        self.generate_and_upload_video(upload_time)
-                        logging.info(f"MANUAL TRIGGER: Successfully completed upload for {upload_time}")
-                    except Exception as e:
-                        logging.error(f"MANUAL TRIGGER: Failed to run upload for {upload_time}: {e}")
-
-            # Run pending jobs with detailed debugging
-            try:
-                # Check each job individually before running
-                for i, job in enumerate(schedule.jobs):
-                    if hasattr(job, 'should_run') and job.should_run:
-                        logging.info(f"SCHEDULER DEBUG: Job {i+1} should run NOW! Executing...")
-                        try:
-                            job.run()
-                            logging.info(f"SCHEDULER DEBUG: Job {i+1} executed successfully!")
-                        except Exception as job_error:
-                            logging.error(f"SCHEDULER DEBUG: Job {i+1} execution failed: {job_error}")
-                
-                # Also run the standard schedule.run_pending()
-                schedule.run_pending()
-            except Exception as e:
-                logging.error(f"SCHEDULER DEBUG: Error running pending jobs: {e}")
-            
-            time.sleep(5)  # Check every 5 seconds for more responsive scheduling
-        
-        logging.info("SCHEDULER DEBUG: YouTube Scheduler stopped")
+        logger.info("SCHEDULER DEBUG: YouTube Scheduler started")
+        if logger.isEnabledFor(logging.INFO):
+            now = self.get_current_ist_time()
+            logger.info("SCHEDULER DEBUG: Current IST time: %s", now.strftime('%Y-%m-%d %H:%M:%S'))
+            # Log next upload times
+            logger.info("SCHEDULER DEBUG: Next upload scheduled for: %s", self.get_next_upload_time(now).strftime('%Y-%m-%d %H:%M:%S IST'))
+        
+        self._arm_next()
     
-    def _check_missed_schedules(self):
-        """Check if we missed any scheduled uploads today and run them"""
-        current_time = self.get_current_ist_time()
-        current_time_str = current_time.strftime('%H:%M')
-        
-        logging.info(f"SCHEDULER DEBUG: Checking for missed schedules at {current_time_str}")
-        
-        # Check each upload time to see if we missed it
-        for upload_time in self.upload_times:
-            # Parse upload time
-            upload_hour, upload_minute = map(int, upload_time.split(':'))
-            current_hour = current_time.hour
-            current_minute = current_time.minute
-            
-            # Check if current time is past the upload time (within 30 minutes)
-            current_minutes = current_hour * 60 + current_minute
-            upload_minutes = upload_hour * 60 + upload_minute
-            
-            # If we're past the upload time but within 30 minutes, run it
-            if upload_minutes < current_minutes <= upload_minutes + 30:
-                logging.info(f"SCHEDULER DEBUG: Missed schedule detected for {upload_time}!")
-                logging.info(f"SCHEDULER DEBUG: Running missed upload for {upload_time}")
-                
-                try:
-                    # Run the missed upload
-                    self.generate_and_upload_video(upload_time)
-                    logging.info(f"SCHEDULER DEBUG: Successfully completed missed upload for {upload_time}")
-                except Exception as e:
-                    logging.error(f"SCHEDULER DEBUG: Failed to run missed upload for {upload_time}: {e}")
-            elif upload_minutes < current_minutes:
-                logging.info(f"SCHEDULER DEBUG: Upload time {upload_time} already passed (more than 30 min ago)")
-            else:
-                logging.info(f"SCHEDULER DEBUG: Upload time {upload_time} is in the future")
+    def _arm_next(self):
+        """Start a one-shot timer for the next upload slot"""
+        now = self.get_current_ist_time()
+        next_upload, upload_time = self._next_slot(now)
+        # Fire a second past the slot so the following arm moves on to the next
+        # slot; timers run on the monotonic clock, so wake at least hourly to
+        # stay in step with wall-clock changes and suspends
+        delay = (next_upload - now).total_seconds() + 1
+        if delay > MAX_TIMER_WAIT:
+            # Wake a couple of seconds short of the slot at the latest, so the
+            # re-arm can't land past it and move on to the following slot
+            delay, upload_time = min(MAX_TIMER_WAIT, delay - 2), None
+        with self._timer_lock:
+            if not self.is_running:
+                return
+            # The slot is bound now, so the timer thread needn't work out what is due
+            self._timer = threading.Timer(max(delay, 0), partial(self._fire, upload_time))
+            self._timer.daemon = True
+            self._timer.start()
+            self.next_fire_at = now + timedelta(seconds=delay)
+        logger.debug("SCHEDULER DEBUG: Timer armed for %s", self.next_fire_at.strftime('%H:%M:%S IST'))
     
-    # Removed _check_immediate_schedules method to prevent duplicate uploads
+    def _fire(self, upload_time):
+        """Run the upload for the slot that just came due, then arm the next timer"""
+        self._arm_next()
+        if upload_time is None:
+            # Periodic re-arm wakeup, nothing due yet
+            return
+        try:
+            self.generate_and_upload_video(upload_time)
+        except Exception as e:
+            logger.error("SCHEDULER DEBUG: Upload for %s failed: %s", upload_time, e)
     
     def start(self):
         """Start the scheduler"""
         if self.is_running:
-            logging.warning("Scheduler is already running!")
+            logger.warning("Scheduler is already running!")
             return
         
+        _start_log_listener()
         self.schedule_uploads()
         self.scheduler_thread = threading.Thread(target=self.run_scheduler, daemon=True)
         self.scheduler_thread.start()
-        logging.info("YouTube Scheduler started successfully!")
+        logger.info("YouTube Scheduler started successfully!")
     
     def stop(self):
         """Stop the scheduler"""
         self.is_running = False
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self.next_fire_at = None
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
-        schedule.clear()
-        logging.info("YouTube Scheduler stopped")
+        if self._catchup_pool is not None:
+            self._catchup_pool.shutdown(wait=False)
+            self._catchup_pool = None
+        self._close_csv_log()
+        logger.info("YouTube Scheduler stopped")
+        _stop_log_listener()
+        log_buffer.flush()
     
-    def get_next_upload_time(self):
+    def get_next_upload_time(self, now=None):
         """Get the next scheduled upload time"""
-        now = self.get_current_ist_time()
-        today = now.date()
-        
-        next_uploads = []
-        for upload_time in self.upload_times:
-            hour, minute = map(int, upload_time.split(':'))
-            upload_datetime = self.ist.localize(datetime.combine(today, datetime.min.time().replace(hour=hour, minute=minute)))
-            
-            # If time has passed today, schedule for tomorrow
-            if upload_datetime <= now:
-                upload_datetime += timedelta(days=1)
-            
-            next_uploads.append(upload_datetime)
-        
-        return min(next_uploads)
+        return self._next_slot(now)[0]
+    
+    def _next_slot(self, now=None):
+        """Return the next upload datetime and its 'HH:MM' slot"""
+        if now is None:
+            now = self.get_current_ist_time()
+        day = now.date()
+        now_secs = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+        
+        # First slot strictly after now; if every slot has passed, take tomorrow's first
+        i = bisect.bisect_right(self._upload_secs, now_secs)
+        if i == len(self._upload_secs):
+            i = 0
+            day += timedelta(days=1)
+        
+        midnight = datetime.combine(day, dt_time(), tzinfo=IST)
+        return midnight + timedelta(seconds=self._upload_secs[i]), self._upload_slots[i]
     
     def status(self):
         """Get scheduler status"""
         if not self.is_running:
             return "Scheduler is not running"
         
-        next_upload = self.get_next_upload_time()
         current_time = self.get_current_ist_time()
+        next_upload = self.get_next_upload_time(current_time)
         time_until_next = next_upload - current_time
         
         hours, remainder = divmod(time_until_next.total_seconds(), 3600)
@@ -607,16 +805,16 @@ class YouTubeScheduler:
     
     def test_trigger_now(self):
         """Test function to manually trigger video generation (for debugging)"""
-        logging.info("TEST DEBUG: Manual trigger test started")
+        logger.info("TEST DEBUG: Manual trigger test started")
         current_time = self.get_current_ist_time().strftime('%H:%M')
-        logging.info(f"TEST DEBUG: Triggering video generation for time slot: {current_time}")
+        logger.info("TEST DEBUG: Triggering video generation for time slot: %s", current_time)
         
         try:
             self.generate_and_upload_video(current_time)
-            logging.info("TEST DEBUG: Manual trigger test completed successfully!")
+            logger.info("TEST DEBUG: Manual trigger test completed successfully!")
             return True
         except Exception as e:
-            logging.error(f"TEST DEBUG: Manual trigger test failed: {e}")
+            logger.error("TEST DEBUG: Manual trigger test failed: %s", e)
             return False
 
 # Global scheduler instance
@@ -6,12 +6,13 @@ Test the scheduler with a time that's about to happen
 
 import os
 import sys
-import time
 import logging
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 from scheduler import scheduler
 
+IST = ZoneInfo('Asia/Kolkata')
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,8 +29,7 @@ def test_scheduler_with_near_time():
     print("=" * 50)
     
     # Get current time
-    ist = pytz.timezone('Asia/Kolkata')
-    current_time = datetime.now(ist)
+    current_time = datetime.now(IST)
     print(f"🕐 Current IST time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Calculate a test time 2 minutes from now
@@ -45,11 +45,13 @@ def test_scheduler_with_near_time():
     try:
         # Start scheduler
         print("🚀 Starting scheduler...")
+        scheduler.upload_complete_event.clear()
         scheduler.start()
         
-        # Wait for the test time
+        # Wait for the test time, returning as soon as the upload attempt finishes
         print(f"⏳ Waiting for {test_time_str}...")
-        time.sleep(130)  # Wait 2 minutes and 10 seconds
+        if not scheduler.upload_complete_event.wait(timeout=130):  # At most 2 minutes and 10 seconds
+            print("⌛ Upload did not finish within the wait window")
         
         # Check if video was created
         output_dir = "outputVideos"
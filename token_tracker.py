@@ -3,40 +3,111 @@ Token Usage Tracker for OpenAI API
 Tracks and logs token usage across all API calls
 """
 
-import json
+import atexit
+import orjson
 import os
+import sys
+import time
+from collections import defaultdict, namedtuple
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List
 
+# Each API call is appended as one JSON line; running totals live in a small
+# separate file so recording a call never rewrites the whole history
+LOG_FILE = "token_usage.jsonl"
+TOTALS_FILE = "token_usage_totals.json"
+# Single-file format used before the split, migrated on first load
+LEGACY_LOG_FILE = "token_usage.json"
+# Minimum seconds between totals rewrites; pending totals are also saved at exit
+TOTALS_FLUSH_INTERVAL = 10
+
+# USD per token as (input, output), looked up once per call; unknown models
+# are billed at gpt-3.5-turbo rates (2024 pricing)
+MODEL_PRICING = {
+    "gpt-3.5-turbo": (0.0015 / 1000, 0.002 / 1000),
+}
+DEFAULT_PRICING = MODEL_PRICING["gpt-3.5-turbo"]
+
+# Picklable stand-in for an OpenAI usage object, e.g. for usage reported back
+# by a worker process
+Usage = namedtuple('Usage', ['prompt_tokens', 'completion_tokens', 'total_tokens'])
+
 class TokenTracker:
-    def __init__(self, log_file: str = "token_usage.json"):
+    def __init__(self, log_file: str = LOG_FILE, totals_file: str = TOTALS_FILE):
         self.log_file = log_file
+        self.totals_file = totals_file
         self.session_usage = {
             "total_prompt_tokens": 0,
             "total_completion_tokens": 0,
             "total_tokens": 0,
             "total_cost": 0.0,
             "calls_count": 0,
-            "start_time": datetime.now().isoformat(),
-            "calls": []
+            "start_time": datetime.now().isoformat()
         }
+        self._calls = None  # Call history, read from the JSONL log on first use
+        self._calls_by_date = None  # Same calls grouped by 'YYYY-MM-DD'
+        self._log_fh = None
+        self._dirty = False  # Totals changed since they were last saved
+        self._last_flush = float('-inf')
+        self._minute = None  # Minute since the epoch that _minute_prefix belongs to
+        self._minute_prefix = ''
         self.load_existing_data()
+        atexit.register(self.close)
     
     def load_existing_data(self):
-        """Load existing usage data from file"""
-        if os.path.exists(self.log_file):
+        """Load existing usage totals from file"""
+        if not os.path.exists(self.totals_file) and os.path.exists(LEGACY_LOG_FILE):
+            self._migrate_legacy_data()
+        if os.path.exists(self.totals_file):
             try:
-                with open(self.log_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.totals_file, 'rb') as f:
+                    data = orjson.loads(f.read())
                     self.session_usage.update(data)
-            except (json.JSONDecodeError, FileNotFoundError):
+            except (orjson.JSONDecodeError, FileNotFoundError):
                 pass
     
+    def _migrate_legacy_data(self):
+        """Split an old token_usage.json into the JSONL call log and totals file"""
+        try:
+            with open(LEGACY_LOG_FILE, 'rb') as f:
+                data = orjson.loads(f.read())
+        except (orjson.JSONDecodeError, FileNotFoundError):
+            return
+        calls = data.pop("calls", [])
+        if calls and not os.path.exists(self.log_file):
+            with open(self.log_file, 'wb') as f:
+                f.writelines(orjson.dumps(call) + b'\n' for call in calls)
+        self.session_usage.update(data)
+        self.save_data()
+    
+    @property
+    def calls(self) -> List[Dict]:
+        """All logged calls, oldest first"""
+        if self._calls is None:
+            self._calls = []
+            if os.path.exists(self.log_file):
+                with open(self.log_file, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            self._calls.append(orjson.loads(line))
+        return self._calls
+    
+    @property
+    def calls_by_date(self) -> Dict[str, List[Dict]]:
+        """Logged calls grouped by the date part of their timestamp"""
+        if self._calls_by_date is None:
+            self._calls_by_date = defaultdict(list)
+            for call in self.calls:
+                self._calls_by_date[call["timestamp"][:10]].append(call)
+        return self._calls_by_date
+    
     def log_usage(self, usage, operation: str = "API Call", model: str = "gpt-3.5-turbo"):
         """Log token usage for a single API call"""
-        # Calculate costs (GPT-3.5-turbo pricing as of 2024)
-        input_cost = (usage.prompt_tokens / 1000) * 0.0015
-        output_cost = (usage.completion_tokens / 1000) * 0.002
+        # Calculate costs
+        input_rate, output_rate = MODEL_PRICING.get(model, DEFAULT_PRICING)
+        input_cost = usage.prompt_tokens * input_rate
+        output_cost = usage.completion_tokens * output_rate
         call_cost = input_cost + output_cost
         
         # Update session totals
@@ -48,7 +119,7 @@ class TokenTracker:
         
         # Log individual call
         call_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._timestamp(),
             "operation": operation,
             "model": model,
             "prompt_tokens": usage.prompt_tokens,
@@ -58,45 +129,77 @@ class TokenTracker:
             "output_cost": output_cost,
             "call_cost": call_cost
         }
-        self.session_usage["calls"].append(call_data)
+        if self._log_fh is None:
+            self._log_fh = open(self.log_file, 'ab', buffering=1 << 16)
+        self._log_fh.write(orjson.dumps(call_data) + b'\n')
+        self._log_fh.flush()
+        if self._calls is not None:
+            self._calls.append(call_data)
+        if self._calls_by_date is not None:
+            self._calls_by_date[call_data["timestamp"][:10]].append(call_data)
         
-        # Print detailed usage
-        print(f"\n🔢 Token Usage ({operation}):")
-        print(f"   📝 Prompt tokens: {usage.prompt_tokens}")
-        print(f"   🤖 Completion tokens: {usage.completion_tokens}")
-        print(f"   📊 Total tokens: {usage.total_tokens}")
-        print(f"💰 Cost for this call:")
-        print(f"   📥 Input cost: ${input_cost:.6f}")
-        print(f"   📤 Output cost: ${output_cost:.6f}")
-        print(f"   💵 Call cost: ${call_cost:.6f}")
+        # Print detailed usage and session totals in one write
+        sys.stdout.write(
+            f"\n🔢 Token Usage ({operation}):\n"
+            f"   📝 Prompt tokens: {usage.prompt_tokens}\n"
+            f"   🤖 Completion tokens: {usage.completion_tokens}\n"
+            f"   📊 Total tokens: {usage.total_tokens}\n"
+            f"💰 Cost for this call:\n"
+            f"   📥 Input cost: ${input_cost:.6f}\n"
+            f"   📤 Output cost: ${output_cost:.6f}\n"
+            f"   💵 Call cost: ${call_cost:.6f}\n"
+            f"\n📈 Session Totals:\n"
+            f"   🔢 Total calls: {self.session_usage['calls_count']}\n"
+            f"   📝 Total prompt tokens: {self.session_usage['total_prompt_tokens']}\n"
+            f"   🤖 Total completion tokens: {self.session_usage['total_completion_tokens']}\n"
+            f"   📊 Total tokens: {self.session_usage['total_tokens']}\n"
+            f"   💵 Total cost: ${self.session_usage['total_cost']:.6f}\n"
+        )
         
-        # Print session totals
-        print(f"\n📈 Session Totals:")
-        print(f"   🔢 Total calls: {self.session_usage['calls_count']}")
-        print(f"   📝 Total prompt tokens: {self.session_usage['total_prompt_tokens']}")
-        print(f"   🤖 Total completion tokens: {self.session_usage['total_completion_tokens']}")
-        print(f"   📊 Total tokens: {self.session_usage['total_tokens']}")
-        print(f"   💵 Total cost: ${self.session_usage['total_cost']:.6f}")
-        
-        # Save to file
-        self.save_data()
+        # Save totals to file, at most every TOTALS_FLUSH_INTERVAL seconds
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= TOTALS_FLUSH_INTERVAL:
+            self.save_data()
+    
+    def _timestamp(self):
+        """Local ISO timestamp with microseconds, reusing the formatted date and minute"""
+        now_us = time.time_ns() // 1000
+        minute, us = divmod(now_us, 60_000_000)
+        if minute != self._minute:
+            self._minute = minute
+            self._minute_prefix = time.strftime('%Y-%m-%dT%H:%M:', time.localtime(minute * 60))
+        return f"{self._minute_prefix}{us // 1_000_000:02d}.{us % 1_000_000:06d}"
     
     def save_data(self):
-        """Save usage data to file"""
+        """Save usage totals to file"""
         self.session_usage["last_updated"] = datetime.now().isoformat()
-        with open(self.log_file, 'w') as f:
-            json.dump(self.session_usage, f, indent=2)
+        # Swap in a complete file so readers never see a half-written one
+        tmp_file = self.totals_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(self.session_usage))
+        os.replace(tmp_file, self.totals_file)
+        self._dirty = False
+        self._last_flush = time.monotonic()
+    
+    def close(self):
+        """Save pending totals and close the call log"""
+        if self._dirty:
+            self.save_data()
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
     
     def get_daily_summary(self):
         """Get summary of today's usage"""
-        today = datetime.now().date().isoformat()
-        today_calls = [
-            call for call in self.session_usage["calls"]
-            if call["timestamp"].startswith(today)
-        ]
+        today = time.strftime('%Y-%m-%d')
+        today_calls = self.calls_by_date.get(today, [])
         
-        daily_tokens = sum(call["total_tokens"] for call in today_calls)
-        daily_cost = sum(call["call_cost"] for call in today_calls)
+        # Tokens and cost in a single pass over today's calls
+        daily_tokens = 0
+        daily_cost = 0.0
+        for call in today_calls:
+            daily_tokens += call["total_tokens"]
+            daily_cost += call["call_cost"]
         
         return {
             "date": today,
@@ -107,40 +210,51 @@ class TokenTracker:
     
     def print_summary(self):
         """Print a comprehensive usage summary"""
-        print("\n" + "="*50)
-        print("📊 OPENAI API USAGE SUMMARY")
-        print("="*50)
-        
-        # Session summary
-        print(f"🕐 Session started: {self.session_usage['start_time']}")
-        print(f"🔢 Total API calls: {self.session_usage['calls_count']}")
-        print(f"📝 Total prompt tokens: {self.session_usage['total_prompt_tokens']:,}")
-        print(f"🤖 Total completion tokens: {self.session_usage['total_completion_tokens']:,}")
-        print(f"📊 Total tokens: {self.session_usage['total_tokens']:,}")
-        print(f"💵 Total cost: ${self.session_usage['total_cost']:.6f}")
-        
-        # Daily summary
         daily = self.get_daily_summary()
-        print(f"\n📅 Today's Usage:")
-        print(f"   🔢 Calls today: {daily['calls']}")
-        print(f"   📊 Tokens today: {daily['total_tokens']:,}")
-        print(f"   💵 Cost today: ${daily['total_cost']:.6f}")
+        
+        # Session summary and daily summary
+        parts = [
+            "\n" + "="*50 + "\n"
+            "📊 OPENAI API USAGE SUMMARY\n"
+            + "="*50 + "\n"
+            f"🕐 Session started: {self.session_usage['start_time']}\n"
+            f"🔢 Total API calls: {self.session_usage['calls_count']}\n"
+            f"📝 Total prompt tokens: {self.session_usage['total_prompt_tokens']:,}\n"
+            f"🤖 Total completion tokens: {self.session_usage['total_completion_tokens']:,}\n"
+            f"📊 Total tokens: {self.session_usage['total_tokens']:,}\n"
+            f"💵 Total cost: ${self.session_usage['total_cost']:.6f}\n"
+            f"\n📅 Today's Usage:\n"
+            f"   🔢 Calls today: {daily['calls']}\n"
+            f"   📊 Tokens today: {daily['total_tokens']:,}\n"
+            f"   💵 Cost today: ${daily['total_cost']:.6f}\n"
+        ]
         
         # Cost projections
         if daily['calls'] > 0:
             monthly_projection = daily['total_cost'] * 30
-            print(f"\n📈 Projections:")
-            print(f"   💰 Monthly cost (if daily usage continues): ${monthly_projection:.2f}")
+            parts.append(
+                f"\n📈 Projections:\n"
+                f"   💰 Monthly cost (if daily usage continues): ${monthly_projection:.2f}\n"
+            )
         
-        print("="*50)
+        parts.append("="*50 + "\n")
+        sys.stdout.write("".join(parts))
+
+@lru_cache(maxsize=1)
+def get_tracker():
+    """Return the shared tracker, creating it on first use"""
+    return TokenTracker()
 
-# Global tracker instance
-tracker = TokenTracker()
+def __getattr__(name):
+    # Keep `from token_tracker import tracker` working without touching disk at import
+    if name == "tracker":
+        return get_tracker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def track_usage(usage, operation: str = "API Call", model: str = "gpt-3.5-turbo"):
     """Convenience function to track usage"""
-    tracker.log_usage(usage, operation, model)
+    get_tracker().log_usage(usage, operation, model)
 
 def print_usage_summary():
     """Print usage summary"""
-    tracker.print_summary()
+    get_tracker().print_summary()
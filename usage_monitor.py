@@ -4,11 +4,15 @@ Real-time Usage Monitor
 Monitors token usage in real-time
 """
 
-import time
 import os
-import json
+import sys
+import threading
+import orjson
 from datetime import datetime
-from token_tracker import tracker
+from token_tracker import LOG_FILE, TOTALS_FILE
+
+# Set to end monitor_usage's loop without waiting out the current poll interval
+stop_event = threading.Event()
 
 def monitor_usage():
     """Monitor usage in real-time"""
@@ -17,36 +21,67 @@ def monitor_usage():
     print("=" * 50)
     
     last_call_count = 0
+    # Running totals over the call log, and how far into it we've read
+    offset = 0
+    current_calls = 0
+    total_tokens = 0
+    total_cost = 0.0
     
     try:
-        while True:
-            # Load current data
-            if os.path.exists("token_usage.json"):
-                with open("token_usage.json", 'r') as f:
-                    data = json.load(f)
+        while not stop_event.is_set():
+            try:
+                size = os.path.getsize(LOG_FILE)
+            except OSError:
+                size = 0
+            
+            if size < offset:
+                # The log was truncated or replaced; count it again from the start
+                offset = 0
+                current_calls = total_tokens = 0
+                total_cost = 0.0
+            
+            if size > offset:
+                # Only parse the calls appended since the last check
+                with open(LOG_FILE, 'rb') as f:
+                    f.seek(offset)
+                    new_data = f.read(size - offset)
+                # Leave a half-written last line for the next check
+                end = new_data.rfind(b'\n') + 1
+                for line in new_data[:end].splitlines():
+                    if line.strip():
+                        call = orjson.loads(line)
+                        current_calls += 1
+                        total_tokens += call["total_tokens"]
+                        total_cost += call["call_cost"]
+                offset += end
                 
-                current_calls = data.get("calls_count", 0)
-                total_cost = data.get("total_cost", 0.0)
-                total_tokens = data.get("total_tokens", 0)
+                # Collect the update and write it to the terminal in one go
+                out = []
                 
                 # Check if there are new calls
                 if current_calls > last_call_count:
                     new_calls = current_calls - last_call_count
-                    print(f"\n🆕 {new_calls} new API call(s) detected!")
-                    print(f"📊 Total calls: {current_calls}")
-                    print(f"🔢 Total tokens: {total_tokens:,}")
-                    print(f"💵 Total cost: ${total_cost:.6f}")
-                    print(f"⏰ {datetime.now().strftime('%H:%M:%S')}")
-                    print("-" * 30)
+                    out.append(
+                        f"\n🆕 {new_calls} new API call(s) detected!\n"
+                        f"📊 Total calls: {current_calls}\n"
+                        f"🔢 Total tokens: {total_tokens:,}\n"
+                        f"💵 Total cost: ${total_cost:.6f}\n"
+                        f"⏰ {datetime.now().strftime('%H:%M:%S')}\n"
+                        f"{'-' * 30}\n"
+                    )
                     
                     last_call_count = current_calls
                 
-                # Show current status
+                # Show current status, clearing whatever was on the line before
                 if current_calls > 0:
                     avg_cost = total_cost / current_calls
-                    print(f"\r💡 Status: {current_calls} calls | ${total_cost:.6f} total | ${avg_cost:.6f} avg/call", end="", flush=True)
+                    out.append(f"\r\x1b[2K💡 Status: {current_calls} calls | ${total_cost:.6f} total | ${avg_cost:.6f} avg/call")
+                
+                if out:
+                    sys.stdout.write("".join(out))
+                    sys.stdout.flush()
             
-            time.sleep(2)  # Check every 2 seconds
+            stop_event.wait(2)  # Check every 2 seconds
             
     except KeyboardInterrupt:
         print("\n\n👋 Monitoring stopped.")
@@ -54,9 +89,9 @@ def monitor_usage():
 
 def print_usage_summary():
     """Print final usage summary"""
-    if os.path.exists("token_usage.json"):
-        with open("token_usage.json", 'r') as f:
-            data = json.load(f)
+    if os.path.exists(TOTALS_FILE):
+        with open(TOTALS_FILE, 'rb') as f:
+            data = orjson.loads(f.read())
         
         print("\n" + "="*50)
         print("📊 FINAL USAGE SUMMARY")
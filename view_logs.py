@@ -5,9 +5,12 @@ Simple script to view and analyze upload logs
 """
 
 import csv
+import io
 import sys
+from collections import deque
 from datetime import datetime
 import os
+from log_tail import open_csv, read_csv_tail, load_upload_stats
 
 def view_logs(limit=20, show_all=False):
     """View upload logs with various options"""
@@ -18,39 +21,53 @@ def view_logs(limit=20, show_all=False):
         return
     
     try:
-        with open(csv_file, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            rows = list(reader)
+        if show_all:
+            with open_csv(csv_file) as file:
+                reader = csv.reader(file)
+                header = next(reader, None)
+                # Like DictReader, skip blank lines, which csv.reader yields as []
+                display_rows = [row for row in reader if row]
+            total = len(display_rows)
+        else:
+            # Parse only the tail of the log; the total comes from the stats cache
+            reader = csv.reader(io.StringIO(read_csv_tail(csv_file, limit), newline=''))
+            header = next(reader, None)
+            display_rows = deque(filter(None, reader), maxlen=limit)
+            total = load_upload_stats(csv_file)['total']
         
-        if not rows:
+        if not total:
             print("INFO: Upload log is empty.")
             return
         
-        if show_all:
-            display_rows = rows
-        else:
-            display_rows = rows[-limit:] if len(rows) > limit else rows
+        column = {name: i for i, name in enumerate(header)}
+        (ts, slot, title, status, url, video_id, error, filename, size_mb, duration, file_hash) = (
+            column[name] for name in (
+                'timestamp', 'upload_time_slot', 'title', 'upload_status', 'youtube_url',
+                'youtube_video_id', 'error_message', 'video_filename', 'video_size_mb',
+                'video_duration_sec', 'file_hash'
+            )
+        )
         
         print(f"\nLOG: cronWorker Upload Log")
         print("=" * 100)
-        print(f"Showing {len(display_rows)} of {len(rows)} total entries")
+        print(f"Showing {len(display_rows)} of {total} total entries")
         print("=" * 100)
         
         for i, row in enumerate(display_rows, 1):
-            status_text = "SUCCESS" if row['upload_status'] == 'success' else "FAILED"
-            print(f"\n{i}. {status_text}: {row['timestamp']}")
-            print(f"   Time Slot: {row['upload_time_slot']}")
-            print(f"   Title: {row['title']}")
+            status_text = "SUCCESS" if row[status] == 'success' else "FAILED"
+            print(f"\n{i}. {status_text}: {row[ts]}")
+            print(f"   Time Slot: {row[slot]}")
+            print(f"   Title: {row[title]}")
             
-            if row['upload_status'] == 'success':
-                print(f"   YOUTUBE: {row['youtube_url']}")
-                print(f"   VIDEO ID: {row['youtube_video_id']}")
+            if row[status] == 'success':
+                print(f"   YOUTUBE: {row[url]}")
+                print(f"   VIDEO ID: {row[video_id]}")
             else:
-                print(f"   ERROR: {row['error_message']}")
+                print(f"   ERROR: {row[error]}")
             
-            print(f"   FILE: {row['video_filename']}")
-            print(f"   SIZE: {row['video_size_mb']} MB | Duration: {row['video_duration_sec']}s")
-            print(f"   HASH: {row['file_hash'][:16]}...")
+            print(f"   FILE: {row[filename]}")
+            print(f"   SIZE: {row[size_mb]} MB | Duration: {row[duration]}s")
+            print(f"   HASH: {row[file_hash][:16]}...")
             print("-" * 100)
             
     except Exception as e:
@@ -65,29 +82,24 @@ def show_stats():
         return
     
     try:
-        with open(csv_file, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            rows = list(reader)
+        # Counters are cached next to the log and only new rows get parsed
+        stats = load_upload_stats(csv_file)
+        total = stats['total']
+        successful = stats['successful']
+        time_slots = stats['time_slots']
         
-        if not rows:
+        if not total:
             print("INFO: Upload log is empty.")
             return
         
-        total = len(rows)
-        successful = len([row for row in rows if row['upload_status'] == 'success'])
+        column = {name: i for i, name in enumerate(stats['header'])}
+        ts, title, status, url = (
+            column[name] for name in ('timestamp', 'title', 'upload_status', 'youtube_url')
+        )
+        
         failed = total - successful
         success_rate = (successful / total * 100) if total > 0 else 0
         
-        # Time slot statistics
-        time_slots = {}
-        for row in rows:
-            slot = row['upload_time_slot']
-            if slot not in time_slots:
-                time_slots[slot] = {'total': 0, 'success': 0}
-            time_slots[slot]['total'] += 1
-            if row['upload_status'] == 'success':
-                time_slots[slot]['success'] += 1
-        
         print(f"\nSTATISTICS: Upload Statistics")
         print("=" * 50)
         print(f"Total uploads: {total}")
@@ -96,17 +108,17 @@ def show_stats():
         print(f"Success rate: {success_rate:.1f}%")
         
         print(f"\nTIME SLOTS:")
-        for slot, stats in time_slots.items():
-            slot_success_rate = (stats['success'] / stats['total'] * 100) if stats['total'] > 0 else 0
-            print(f"  {slot}: {stats['success']}/{stats['total']} ({slot_success_rate:.1f}%)")
+        for slot, counts in time_slots.items():
+            slot_success_rate = (counts['success'] / counts['total'] * 100) if counts['total'] > 0 else 0
+            print(f"  {slot}: {counts['success']}/{counts['total']} ({slot_success_rate:.1f}%)")
         
         # Recent activity
-        recent_successful = [row for row in rows[-10:] if row['upload_status'] == 'success']
+        recent_successful = [row for row in stats['recent'] if row[status] == 'success']
         if recent_successful:
             print(f"\nRECENT SUCCESSFUL UPLOADS:")
             for row in recent_successful[-5:]:
-                print(f"  * {row['timestamp']} - {row['title'][:50]}...")
-                print(f"    {row['youtube_url']}")
+                print(f"  * {row[ts]} - {row[title][:50]}...")
+                print(f"    {row[url]}")
         
     except Exception as e:
         print(f"ERROR: Error reading statistics: {e}")
@@ -121,26 +133,43 @@ def export_logs():
         return
     
     try:
-        with open(csv_file, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            rows = list(reader)
+        # Format every entry into one buffer while streaming the log, then
+        # write the export with a single call
+        entries = []
+        with open_csv(csv_file) as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header:
+                column = {name: i for i, name in enumerate(header)}
+                ts, slot, status, title, url, error, filename, size_mb = (
+                    column[name] for name in (
+                        'timestamp', 'upload_time_slot', 'upload_status', 'title',
+                        'youtube_url', 'error_message', 'video_filename', 'video_size_mb'
+                    )
+                )
+                # Blank lines come through as [] and aren't entries
+                for i, row in enumerate(filter(None, reader), 1):
+                    if row[status] == 'success':
+                        outcome = f"   YouTube: {row[url]}\n"
+                    else:
+                        outcome = f"   Error: {row[error]}\n"
+                    entries.append(
+                        f"{i}. {row[ts]} - {row[slot]}\n"
+                        f"   Status: {row[status]}\n"
+                        f"   Title: {row[title]}\n"
+                        f"{outcome}"
+                        f"   File: {row[filename]} ({row[size_mb]} MB)\n"
+                        f"{'-' * 50}\n"
+                    )
         
+        header_text = (
+            "cronWorker Upload Log Export\n"
+            f"{'=' * 50}\n"
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Total entries: {len(entries)}\n\n"
+        )
         with open(export_file, 'w', encoding='utf-8') as outfile:
-            outfile.write("cronWorker Upload Log Export\n")
-            outfile.write("=" * 50 + "\n")
-            outfile.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            outfile.write(f"Total entries: {len(rows)}\n\n")
-            
-            for i, row in enumerate(rows, 1):
-                outfile.write(f"{i}. {row['timestamp']} - {row['upload_time_slot']}\n")
-                outfile.write(f"   Status: {row['upload_status']}\n")
-                outfile.write(f"   Title: {row['title']}\n")
-                if row['upload_status'] == 'success':
-                    outfile.write(f"   YouTube: {row['youtube_url']}\n")
-                else:
-                    outfile.write(f"   Error: {row['error_message']}\n")
-                outfile.write(f"   File: {row['video_filename']} ({row['video_size_mb']} MB)\n")
-                outfile.write("-" * 50 + "\n")
+            outfile.write(header_text + "".join(entries))
         
         print(f"SUCCESS: Log exported to: {export_file}")
         
@@ -4,31 +4,34 @@ View OpenAI API Usage
 Run this script to see your token usage and costs
 """
 
-from token_tracker import print_usage_summary, tracker
-import json
+from token_tracker import print_usage_summary, get_tracker, TOTALS_FILE
 import os
+import sys
 
 def main():
     print("🔍 Checking OpenAI API Usage...")
     
-    if not os.path.exists("token_usage.json"):
+    if not os.path.exists(TOTALS_FILE):
         print("❌ No usage data found. Run your application first to generate usage data.")
         return
     
     # Print comprehensive summary
+    tracker = get_tracker()
     print_usage_summary()
     
     # Show recent calls
-    if tracker.session_usage["calls"]:
-        print("\n📋 Recent API Calls:")
-        print("-" * 80)
-        recent_calls = tracker.session_usage["calls"][-5:]  # Last 5 calls
+    if tracker.calls:
+        parts = ["\n📋 Recent API Calls:\n", "-" * 80 + "\n"]
+        recent_calls = tracker.calls[-5:]  # Last 5 calls
         
         for i, call in enumerate(recent_calls, 1):
             timestamp = call["timestamp"][:19].replace("T", " ")
-            print(f"{i}. {call['operation']} - {timestamp}")
-            print(f"   Tokens: {call['total_tokens']} | Cost: ${call['call_cost']:.6f}")
-            print()
+            parts.append(
+                f"{i}. {call['operation']} - {timestamp}\n"
+                f"   Tokens: {call['total_tokens']} | Cost: ${call['call_cost']:.6f}\n"
+                "\n"
+            )
+        sys.stdout.write("".join(parts))
     
     # Show cost breakdown
     if tracker.session_usage["calls_count"] > 0:
@@ -36,11 +39,9 @@ def main():
         print(f"📊 Average cost per call: ${avg_cost_per_call:.6f}")
         
         # Estimate monthly cost
-        daily_calls = len([call for call in tracker.session_usage["calls"] 
-                          if call["timestamp"].startswith(tracker.session_usage["start_time"][:10])])
-        if daily_calls > 0:
-            daily_cost = sum(call["call_cost"] for call in tracker.session_usage["calls"] 
-                           if call["timestamp"].startswith(tracker.session_usage["start_time"][:10]))
+        daily_calls = tracker.calls_by_date.get(tracker.session_usage["start_time"][:10], [])
+        if daily_calls:
+            daily_cost = sum(call["call_cost"] for call in daily_calls)
             monthly_estimate = daily_cost * 30
             print(f"📈 Estimated monthly cost: ${monthly_estimate:.2f}")
 